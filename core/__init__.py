@@ -5,7 +5,7 @@ Module core - Contient les algorithmes de clustering et de fusion.
 from .distance_matrix import DistanceMatrix
 from .clustering import AgglomerativeClustering
 from .merger import FileMerger
-from .namenode_memory import NameNodeMemory, METADATA_BYTES_PER_FILE
+from .namenode_memory import NameNodeMemory, MemoryReduction, METADATA_BYTES_PER_FILE
 from .file_index import FileIndex
 from .dendrogram import Dendrogram, MergeNode
 
@@ -14,6 +14,7 @@ __all__ = [
     'AgglomerativeClustering', 
     'FileMerger',
     'NameNodeMemory',
+    'MemoryReduction',
     'METADATA_BYTES_PER_FILE',
     'FileIndex',
     'Dendrogram',
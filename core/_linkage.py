@@ -0,0 +1,179 @@
+"""
+Noyau de calcul de l'Algorithm 1 (single-linkage sous contrainte de taille).
+
+Le noyau ne manipule que des structures plates (listes de flottants et
+d'entiers) et ne crée aucun objet Cluster: il retourne la séquence des
+fusions, que AgglomerativeClustering rejoue ensuite pour construire les
+clusters, le dendrogramme et le journal d'exécution.
+
+Numérotation des noeuds (convention de scipy.cluster.hierarchy.linkage):
+- Feuilles: 0 .. n-1 (un fichier par feuille, dans l'ordre d'entrée)
+- Fusion k: n + k
+
+La distance étant unidimensionnelle (De(Fi, Fj) = |size_i - size_j|), la
+distance single-linkage entre deux clusters est le plus petit écart entre
+deux de leurs fichiers. Une fois les tailles triées, les écarts entre
+fichiers peuvent être énumérés par ordre croissant sans construire la
+matrice n x n: pour chaque position p, les écarts vers p+1, p+2, ... sont
+croissants. Un tas ne contient qu'une tête de flux par position, la
+mémoire est en O(n) au lieu de O(n²).
+"""
+
+import heapq
+from array import array
+from typing import List, Sequence, Tuple
+
+
+# Marqueur d'une entrée "flux à développer" dans le tas: se classe avant
+# toute paire réelle de même écart, dont les numéros de noeuds sont >= 0
+_STREAM = -1
+
+
+def single_linkage_capped(sizes: Sequence[float],
+                          cap: float) -> List[Tuple[int, int, float]]:
+    """
+    [ALGORITHM 1 - Lignes 1-15] Single-linkage avec contrainte |C| + |C'| <= cap.
+
+    À chaque étape, la paire de clusters la plus proche (distance
+    single-linkage) dont la taille cumulée respecte la contrainte est
+    fusionnée. Les égalités de distance sont départagées par les numéros
+    de noeuds (le plus petit d'abord), comme un tri stable des paires.
+
+    Principe:
+    - Les fichiers sont triés par taille; chaque position p produit un flux
+      d'arêtes (p, q), q > p, d'écart croissant. Les arêtes de même écart
+      sont toutes exposées ensemble, le reste du flux est représenté par
+      une seule entrée marqueur.
+    - Chaque arête du tas porte la clé (écart, noeud_min, noeud_max) calculée
+      à l'insertion. Les numéros de noeuds ne font que croître au fil des
+      fusions: une clé périmée est une borne inférieure, elle est recalculée
+      et réinsérée au moment où elle sort du tas.
+    - Une paire trop grande pour la contrainte l'est définitivement (les
+      clusters ne font que grossir) et est abandonnée. Un cluster qui ne
+      peut même plus absorber le plus petit cluster actif arrête ses flux.
+    - Si le plus petit cluster actif dépasse la moitié de la contrainte,
+      plus aucune fusion n'est possible: arrêt anticipé (testé avant la
+      boucle puis après chaque fusion).
+
+    Args:
+        sizes (Sequence[float]): Taille de chaque fichier en MB (liste ou
+            array('d'))
+        cap (float): Taille maximale d'un cluster en MB
+
+    Returns:
+        List[Tuple[int, int, float]]: Fusions (noeud_i, noeud_j, distance)
+                                      avec noeud_i < noeud_j, dans l'ordre
+    """
+    n = len(sizes)
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+
+    # Fichiers triés par taille (tri stable: égalités dans l'ordre d'entrée)
+    order = sorted(range(n), key=sizes.__getitem__)
+    # Tailles contiguës (array 'd'): pas d'objet float par fichier en mémoire
+    values = array('d', [sizes[leaf] for leaf in order])
+
+    # Union-find sur les positions triées; la racine porte le noeud et la taille
+    parent = list(range(n))
+    node_of_root = order[:]
+    size_of_root = array('d', values)
+    root_of_node = {leaf: pos for pos, leaf in enumerate(order)}
+
+    def find(pos: int) -> int:
+        root = pos
+        while parent[root] != root:
+            root = parent[root]
+        while parent[pos] != root:
+            parent[pos], pos = root, parent[pos]
+        return root
+
+    # Tailles des clusters actifs (suppression paresseuse des noeuds fusionnés)
+    size_heap = [(values[pos], order[pos]) for pos in range(n)]
+    heapq.heapify(size_heap)
+
+    def min_active_size() -> float:
+        while size_heap[0][1] not in root_of_node:
+            heappop(size_heap)
+        return size_heap[0][0]
+
+    # Arrêt anticipé: si les deux plus petits fichiers dépassent ensemble la
+    # contrainte, aucune paire n'est fusionnable. Le minimum des tailles
+    # actives ne change qu'à une fusion: le test est refait après chacune.
+    if n > 1 and values[0] + values[0] > cap:
+        return []
+
+    # [Lignes 1-6] Un flux par position, à développer à partir de p+1
+    heap = [(values[pos + 1] - values[pos], _STREAM, _STREAM, pos, pos + 1)
+            for pos in range(n - 1)]
+    heapq.heapify(heap)
+
+    merges = []
+    next_node = n
+    alive = n
+
+    # [Lignes 8-14] Boucle de fusion
+    while alive > 1 and heap:
+        gap, node_lo, node_hi, p, q = heappop(heap)
+        root_p = find(p)
+
+        if node_lo == _STREAM:
+            # Flux inutile si le cluster de p ne peut plus rien absorber
+            if size_of_root[root_p] + min_active_size() > cap:
+                continue
+            # Exposer toutes les arêtes (p, q') de même écart
+            base = values[p]
+            while q < n and values[q] - base == gap:
+                root_q = find(q)
+                if root_q != root_p:
+                    node_p = node_of_root[root_p]
+                    node_q = node_of_root[root_q]
+                    if node_p < node_q:
+                        heappush(heap, (gap, node_p, node_q, p, q))
+                    else:
+                        heappush(heap, (gap, node_q, node_p, p, q))
+                q += 1
+            if q < n:
+                heappush(heap, (values[q] - base, _STREAM, _STREAM, p, q))
+            continue
+
+        root_q = find(q)
+        # Arête interne à un cluster
+        if root_p == root_q:
+            continue
+
+        # [Ligne 10] Contrainte de taille; une paire refusée l'est définitivement
+        merged_size = size_of_root[root_p] + size_of_root[root_q]
+        if merged_size > cap:
+            continue
+
+        # Clé périmée: la réinsérer avec les numéros de noeuds actuels
+        node_p = node_of_root[root_p]
+        node_q = node_of_root[root_q]
+        if node_q < node_p:
+            node_p, node_q = node_q, node_p
+        if node_p != node_lo or node_q != node_hi:
+            heappush(heap, (gap, node_p, node_q, p, q))
+            continue
+
+        # [Ligne 11] Fusion des deux clusters
+        merges.append((node_p, node_q, gap))
+        new_node = next_node
+        next_node += 1
+        alive -= 1
+
+        parent[root_q] = root_p
+        node_of_root[root_p] = new_node
+        size_of_root[root_p] = merged_size
+        del root_of_node[node_p]
+        del root_of_node[node_q]
+        root_of_node[new_node] = root_p
+        heappush(size_heap, (merged_size, new_node))
+
+        # Arrêt anticipé: même les deux plus petits clusters sont trop grands
+        if alive > 1:
+            smallest = min_active_size()
+            if smallest + smallest > cap:
+                break
+
+    # [Ligne 15] Return(C)
+    return merges
@@ -6,11 +6,12 @@ Distance utilisée: Distance Euclidienne basée sur la taille des fichiers
 Contrainte: Taille maximale d'un cluster ≤ taille de bloc HDFS (128 MB)
 """
 
-from typing import List
+from array import array
+from typing import List, Optional, Tuple
 from models.small_file import SmallFile, SMALL_FILE_THRESHOLD, SMALL_FILE_MAX_SIZE_MB
 from models.cluster import Cluster
-from .distance_matrix import DistanceMatrix
 from .dendrogram import Dendrogram
+from ._linkage import single_linkage_capped
 
 
 class AgglomerativeClustering:
@@ -27,12 +28,18 @@ class AgglomerativeClustering:
     
     Attributes:
         max_cluster_size_mb (float): Taille de bloc HDFS (128 MB par défaut)
+        verbose (int): Niveau d'affichage (0: silencieux, 1: résumé, 2: trace détaillée)
         clusters (List[Cluster]): Liste des clusters C = {C1, C2, ..., Cm}
-        distance_matrix (DistanceMatrix): Matrice De(Fi, Fj) entre clusters
         dendrogram (Dendrogram): Représentation arborescente des fusions
+        linkage_matrix_ (List[Tuple[int, int, float, int]]): Fusions au format
+            de scipy.cluster.hierarchy.linkage, une ligne par fusion:
+            (noeud_i, noeud_j, distance, nombre de fichiers). Les feuilles
+            sont numérotées 0 .. n-1, la fusion k crée le noeud n + k.
+            Avec la contrainte de taille, il peut y avoir moins de n - 1
+            lignes (forêt de clusters finaux).
     """
     
-    def __init__(self, max_cluster_size_mb: float = 128.0):
+    def __init__(self, max_cluster_size_mb: float = 128.0, verbose: int = 0):
         """
         Initialise l'algorithme de clustering.
         
@@ -41,16 +48,26 @@ class AgglomerativeClustering:
         
         Args:
             max_cluster_size_mb (float): Taille maximale d'un cluster (défaut: 128 MB)
+            verbose (int): Niveau d'affichage (défaut: 0)
+                           - 0: aucun affichage
+                           - 1: configuration et résumé final
+                           - 2: trace de chaque itération (lignes de l'Algorithm 1)
         """
         self.max_cluster_size_mb = max_cluster_size_mb
+        self.verbose = verbose
         self.clusters = []
-        self.distance_matrix = None
         self._iteration_count = 0
+        # Tailles des clusters initiaux, alignées sur self.clusters (array 'd')
+        self._sizes = array('d')
         # Dendrogramme: "The dendrogram is a multilevel hierarchy where clusters 
         # at one level are joined together to form the clusters at the next levels"
         self.dendrogram = Dendrogram()
         # Historique des étapes de l'Algorithm 1 (lignes 1-15)
         self._algorithm_steps = []
+        # Fusions au format linkage de SciPy (rempli par fit)
+        self.linkage_matrix_: List[Tuple[int, int, float, int]] = []
+        # ID du cluster créé par chaque fusion, aligné sur linkage_matrix_
+        self._merged_ids: List[int] = []
     
     def fit(self, files: List[SmallFile]) -> List[Cluster]:
         """
@@ -73,52 +90,64 @@ class AgglomerativeClustering:
         Returns:
             List[Cluster]: Liste des clusters C = {C1, C2, ..., Cm}
         """
-        print(f"\n{'='*60}")
-        print(f"DÉMARRAGE DU CLUSTERING HIÉRARCHIQUE AGGLOMÉRATIF")
-        print(f"{'='*60}")
-        print(f"Configuration HDFS (selon article):")
-        print(f"  - Taille de bloc: {self.max_cluster_size_mb} MB")
-        print(f"  - Seuil petits fichiers: {SMALL_FILE_THRESHOLD*100:.0f}% = {SMALL_FILE_MAX_SIZE_MB:.1f} MB")
-        print(f"  - Taille max cluster: {self.max_cluster_size_mb} MB")
-        print(f"\nFichiers analysés:")
-        print(f"  - Total reçu: {len(files)}")
-        small_file_count = sum(1 for f in files if f.size_mb < SMALL_FILE_MAX_SIZE_MB)
-        large_file_count = len(files) - small_file_count
-        print(f"  - Petits fichiers (< {SMALL_FILE_MAX_SIZE_MB:.1f} MB): {small_file_count}")
-        print(f"  - Fichiers exclus (>= {SMALL_FILE_MAX_SIZE_MB:.1f} MB): {large_file_count}")
-        print(f"  - Méthode de linkage: SINGLE-LINKAGE")
+        # Une seule lecture des tailles, réutilisée pour le comptage et le noyau
+        sizes = [f.size_mb for f in files]
+        
+        if self.verbose >= 1:
+            print(f"\n{'='*60}")
+            print(f"DÉMARRAGE DU CLUSTERING HIÉRARCHIQUE AGGLOMÉRATIF")
+            print(f"{'='*60}")
+            print(f"Configuration HDFS (selon article):")
+            print(f"  - Taille de bloc: {self.max_cluster_size_mb} MB")
+            print(f"  - Seuil petits fichiers: {SMALL_FILE_THRESHOLD*100:.0f}% = {SMALL_FILE_MAX_SIZE_MB:.1f} MB")
+            print(f"  - Taille max cluster: {self.max_cluster_size_mb} MB")
+            print(f"\nFichiers analysés:")
+            print(f"  - Total reçu: {len(files)}")
+            small_file_count = sum(1 for size in sizes if size < SMALL_FILE_MAX_SIZE_MB)
+            large_file_count = len(files) - small_file_count
+            print(f"  - Petits fichiers (< {SMALL_FILE_MAX_SIZE_MB:.1f} MB): {small_file_count}")
+            print(f"  - Fichiers exclus (>= {SMALL_FILE_MAX_SIZE_MB:.1f} MB): {large_file_count}")
+            print(f"  - Méthode de linkage: SINGLE-LINKAGE")
         
         # [ALGORITHM 1 - Ligne 7] Initialisation: C = {{F} | F ∈ S}
         # Chaque fichier devient un cluster initial
-        self._initialize_clusters(files)
+        self._initialize_clusters(files, sizes)
+        
+        # Le dendrogramme ne décrit que les fusions de cet appel
+        self.dendrogram.reset()
         
-        # [ALGORITHM 1 - Lignes 1-6] Création de la matrice de distance euclidienne
+        # [ALGORITHM 1 - Lignes 1-6] Matrice de distance euclidienne (dans le noyau)
         # Selon l'article: "The Euclidean distance measure is used to cluster the small files"
         # Formule: d(i,j) = |size_i - size_j| (distance basée sur la taille)
-        self.distance_matrix = DistanceMatrix(self.clusters)
         self._algorithm_steps.append("[Lignes 1-6] Matrice de distance euclidienne calculée")
         
-        print(f"\nInitialisation terminée: {len(self.clusters)} clusters créés")
-        print("\n[ALGORITHM 1 - Lignes 1-6] Calcul de la matrice de distance euclidienne...\n")
+        if self.verbose >= 2:
+            print(f"\nInitialisation terminée: {len(self.clusters)} clusters créés")
+            print("\n[ALGORITHM 1 - Lignes 1-6] Calcul de la matrice de distance euclidienne...\n")
         
         # [ALGORITHM 1 - Lignes 8-14] Boucle de fusion itérative
         # "While sizeOfEachCluster |C| < 128MB Do"
-        print("[ALGORITHM 1 - Lignes 8-14] Début du processus de fusion itératif...\n")
+        if self.verbose >= 2:
+            print("[ALGORITHM 1 - Lignes 8-14] Début du processus de fusion itératif...\n")
         self._algorithm_steps.append("[Ligne 7] Initialisation: C = {{F} | F ∈ S}")
+        leaf_clusters = self.clusters
         self._agglomerate()
         
-        print(f"\n{'='*60}")
-        print(f"CLUSTERING TERMINÉ")
-        print(f"{'='*60}")
-        print(f"Nombre de clusters finaux: {len(self.clusters)}")
-        print(f"Nombre d'itérations: {self._iteration_count}")
+        if self.verbose >= 1:
+            print(f"\n{'='*60}")
+            print(f"CLUSTERING TERMINÉ")
+            print(f"{'='*60}")
+            print(f"Nombre de clusters finaux: {len(self.clusters)}")
+            print(f"Nombre d'itérations: {self._iteration_count}")
         
-        # Construire le dendrogramme et l'afficher
-        self.dendrogram.build_from_clusters(self.clusters)
+        # Construire le dendrogramme (arbre réel des fusions) et l'afficher
+        self.dendrogram.build_from_linkage(leaf_clusters, self.linkage_matrix_, self.clusters,
+                                           self._merged_ids)
         
         return self.clusters
     
-    def _initialize_clusters(self, files: List[SmallFile]) -> None:
+    def _initialize_clusters(self, files: List[SmallFile],
+                             sizes: Optional[List[float]] = None) -> None:
         """
         [ALGORITHM 1 - Ligne 7] Initialise les clusters.
         
@@ -127,6 +156,7 @@ class AgglomerativeClustering:
         
         Args:
             files (List[SmallFile]): Liste des fichiers S = {F1, F2, ..., Fn}
+            sizes (Optional[List[float]]): Tailles déjà lues (une par fichier)
         """
         # Réinitialiser le compteur d'IDs pour cohérence
         Cluster.reset_counter()
@@ -136,6 +166,11 @@ class AgglomerativeClustering:
         for file in files:
             cluster = Cluster([file])
             self.clusters.append(cluster)
+        
+        # Tailles des clusters initiaux (un fichier par cluster)
+        if sizes is None:
+            sizes = [f.size_mb for f in files]
+        self._sizes = array('d', sizes)
     
     def _agglomerate(self) -> None:
         """
@@ -148,84 +183,77 @@ class AgglomerativeClustering:
         - [Ligne 11] "C = ({C} ∪ {C'})" (fusion des clusters)
         - [Ligne 13] "Update distance matrix (C, S, De)"
         
-        La fusion continue tant que des paires peuvent être fusionnées
-        sans dépasser la taille maximale de bloc HDFS (128 MB).
+        La boucle elle-même s'exécute dans le noyau single_linkage_capped
+        (core/_linkage.py), sur les seules tailles des fichiers. Cette méthode
+        rejoue ensuite la séquence de fusions retournée pour construire les
+        objets Cluster, le dendrogramme et le journal d'exécution.
+        
+        La trace détaillée (et l'historique des itérations) n'est produite
+        qu'avec verbose >= 2.
         """
-        while len(self.distance_matrix) > 1:
-            # Obtenir toutes les paires triées par distance
-            all_pairs = self.distance_matrix.get_all_pairs_sorted()
-            
-            if not all_pairs:
-                break
-            
-            # Chercher la première paire fusionnable
-            merged_something = False
+        trace = self.verbose >= 2
+        
+        merges = single_linkage_capped(self._sizes, self.max_cluster_size_mb)
+        linkage_matrix = []
+        merged_ids = []
+        
+        # Clusters actifs indexés par numéro de noeud (feuilles: 0 .. n-1)
+        nodes = dict(enumerate(self.clusters))
+        num_leaves = next_node = len(self.clusters)
+        
+        for node_i, node_j, distance in merges:
+            cluster_i = nodes.pop(node_i)
+            cluster_j = nodes.pop(node_j)
+            self._iteration_count += 1
             
-            for i, j, distance in all_pairs:
-                cluster_i = self.distance_matrix.clusters[i]
-                cluster_j = self.distance_matrix.clusters[j]
+            if trace:
+                size_i = cluster_i.get_total_size()
+                size_j = cluster_j.get_total_size()
                 
                 # [Ligne 9] Sélection single-linkage: min De(Fi, Fj)
                 # "The single-linkage clustering is the minimum distance between elements"
                 print(f"[Ligne 9] Single-linkage: min distance = {distance:.2f} MB")
                 
                 # [Ligne 10] Vérification contrainte: |C| + |C'| <= 128MB
-                total_size = cluster_i.get_total_size() + cluster_j.get_total_size()
-                print(f"[Ligne 10] Contrainte: {cluster_i.get_total_size():.2f} + {cluster_j.get_total_size():.2f} = {total_size:.2f} MB <= {self.max_cluster_size_mb} MB")
-                
-                if cluster_i.can_merge_with(cluster_j, self.max_cluster_size_mb):
-                    self._iteration_count += 1
-                    
-                    print(f"Fusion: Cluster {cluster_i.cluster_id} ({cluster_i.get_total_size():.2f} MB) + Cluster {cluster_j.cluster_id} ({cluster_j.get_total_size():.2f} MB)")
-                    print(f"Distance euclidienne: {distance:.2f} MB")
-                    
-                    # [Ligne 11] C = ({C} ∪ {C'}) - Fusion des deux clusters
-                    print(f"[Ligne 11] Fusion: C = (C{cluster_i.cluster_id} ∪ C{cluster_j.cluster_id})")
-                    self.distance_matrix.merge_clusters(i, j)
-                    
-                    merged = self.distance_matrix.clusters[-1]
-                    print(f"-> Nouveau cluster C{merged.cluster_id} créé ({merged.get_total_size():.2f} MB, {len(merged.files)} fichiers)")
-                    
-                    # Enregistrement dans le dendrogramme (structure hiérarchique)
-                    self.dendrogram.record_merge(cluster_i.cluster_id, cluster_j.cluster_id, merged.cluster_id, distance)
-                    
-                    # [Ligne 13] Mise à jour de la matrice de distance
-                    print(f"[Ligne 13] Mise à jour matrice de distance")
-                    print(f"Clusters restants: {len(self.distance_matrix)}")
-                    
-                    # Enregistrer l'étape dans l'historique
-                    self._algorithm_steps.append(f"Itération {self._iteration_count}: C{cluster_i.cluster_id} ∪ C{cluster_j.cluster_id} -> C{merged.cluster_id}")
-                    
-                    merged_something = True
-                    break  # Sortir de la boucle for et recalculer les paires
+                print(f"[Ligne 10] Contrainte: {size_i:.2f} + {size_j:.2f} = {size_i + size_j:.2f} MB <= {self.max_cluster_size_mb} MB")
+                print(f"Fusion: Cluster {cluster_i.cluster_id} ({size_i:.2f} MB) + Cluster {cluster_j.cluster_id} ({size_j:.2f} MB)")
+                print(f"Distance euclidienne: {distance:.2f} MB")
+                print(f"[Ligne 11] Fusion: C = (C{cluster_i.cluster_id} ∪ C{cluster_j.cluster_id})")
+            
+            # [Ligne 11] C = ({C} ∪ {C'}) - Fusion des deux clusters
+            # Un cluster intermédiaire n'est plus référencé après la fusion:
+            # sa liste de fichiers est étendue sur place. Celle d'une feuille
+            # reste partagée avec le dendrogramme et est copiée.
+            merged = cluster_i.merge_with(cluster_j, reuse_files=node_i >= num_leaves)
+            nodes[next_node] = merged
+            next_node += 1
+            linkage_matrix.append((node_i, node_j, distance, len(merged.files)))
+            merged_ids.append(merged.cluster_id)
+            
+            # Enregistrement dans le dendrogramme (structure hiérarchique)
+            self.dendrogram.record_merge(cluster_i.cluster_id, cluster_j.cluster_id, merged.cluster_id, distance)
             
-            # Si aucune fusion n'a été effectuée, arrêter
-            if not merged_something:
-                print("\nAucune fusion supplémentaire possible avec la contrainte de taille.")
-                break
+            if trace:
+                print(f"-> Nouveau cluster C{merged.cluster_id} créé ({merged.get_total_size():.2f} MB, {len(merged.files)} fichiers)")
+                
+                # [Ligne 13] Mise à jour de la matrice de distance (faite par le noyau)
+                print(f"[Ligne 13] Mise à jour matrice de distance")
+                print(f"Clusters restants: {len(nodes)}")
+                
+                # Enregistrer l'étape dans l'historique
+                self._algorithm_steps.append(f"Itération {self._iteration_count}: C{cluster_i.cluster_id} ∪ C{cluster_j.cluster_id} -> C{merged.cluster_id}")
+        
+        # Si des clusters restent sans fusion possible, le signaler
+        if trace and len(nodes) > 1:
+            print("\nAucune fusion supplémentaire possible avec la contrainte de taille.")
         
         # [Ligne 15] Return(C) - Retourner les clusters finaux
-        self.clusters = self.distance_matrix.clusters
+        # (ordre d'insertion: clusters restants d'origine puis clusters fusionnés)
+        self.clusters = list(nodes.values())
+        self.linkage_matrix_ = linkage_matrix
+        self._merged_ids = merged_ids
         self._algorithm_steps.append(f"[Ligne 15] Return(C) avec {len(self.clusters)} clusters")
     
-    def _all_pairs_checked(self, unfusable_pairs: set) -> bool:
-        """
-        Vérifie si toutes les paires de clusters ont été testées.
-        
-        Utilisé pour déterminer la condition d'arrêt de la boucle de fusion
-        lorsque plus aucune paire ne peut être fusionnée sans violer
-        la contrainte de taille (|C| + |C'| > 128 MB).
-        
-        Args:
-            unfusable_pairs (set): Ensemble des paires (Ci, Cj) non fusionnables
-            
-        Returns:
-            bool: True si toutes les paires ont été vérifiées
-        """
-        n = len(self.distance_matrix)
-        total_pairs = n * (n - 1) // 2
-        return len(unfusable_pairs) >= total_pairs
-    
     def get_clusters(self) -> List[Cluster]:
         """
         Retourne la liste des clusters finaux C = {C1, C2, ..., Cm}.
@@ -274,6 +302,7 @@ class AgglomerativeClustering:
         "Algorithm 1: Small Files Merging Algorithm"
         
         Affiche chaque étape (lignes 1-15) avec les clusters fusionnés.
+        Le détail des itérations n'est enregistré qu'avec verbose >= 2.
         """
         print(f"\n{'='*70}")
         print(f"JOURNAL D'EXÉCUTION - Algorithm 1: Small Files Merging")
@@ -14,7 +14,9 @@ Exemple de l'article (Figure 2 - Section 4.2):
 - F2-F4-F6-F5 forment Cluster 2 (120 MB)
 """
 
-from typing import List, Optional, Tuple
+import io
+import sys
+from typing import Callable, Iterator, List, Optional, Tuple
 from models.cluster import Cluster
 from models.small_file import SmallFile
 
@@ -25,15 +27,26 @@ class MergeNode:
     
     Attributes:
         cluster_id (int): ID du cluster
-        files (List[SmallFile]): Fichiers dans ce noeud
+        files (Iterator[SmallFile]): Fichiers dans ce noeud (liste pour une
+            feuille, parcours paresseux des enfants pour un noeud interne)
         left (Optional[MergeNode]): Enfant gauche (cluster fusionné)
         right (Optional[MergeNode]): Enfant droit (cluster fusionné)
         merge_distance (float): Distance lors de la fusion
         total_size (float): Taille totale du cluster
+    
+    Un noeud n'est plus modifié une fois l'arbre construit: la hauteur et
+    la liste des feuilles sont calculées au premier appel puis mémorisées.
+    Seules les feuilles possèdent une liste de fichiers; un noeud interne
+    ne recopie pas celles de ses enfants.
     """
     
+    # Pas de __dict__ par instance: mémoire réduite pour les grands arbres
+    __slots__ = ('cluster_id', '_files', 'left', 'right', 'merge_distance',
+                 'total_size', 'is_leaf', '_leaf_names_cache', '_height_cache')
+    
     def __init__(self, cluster_id: int, files: List[SmallFile], 
-                 merge_distance: float = 0.0):
+                 merge_distance: float = 0.0,
+                 precomputed_total: Optional[float] = None):
         """
         Initialise un noeud de fusion.
         
@@ -41,14 +54,20 @@ class MergeNode:
             cluster_id (int): ID du cluster
             files (List[SmallFile]): Fichiers contenus
             merge_distance (float): Distance de fusion
+            precomputed_total (Optional[float]): Taille totale déjà connue
+                (évite de resommer tous les fichiers)
         """
         self.cluster_id = cluster_id
-        self.files = files
+        self._files: Optional[List[SmallFile]] = files
         self.left: Optional[MergeNode] = None
         self.right: Optional[MergeNode] = None
         self.merge_distance = merge_distance
-        self.total_size = sum(f.size_mb for f in files)
+        if precomputed_total is None:
+            precomputed_total = sum(f.size_mb for f in files)
+        self.total_size = precomputed_total
         self.is_leaf = True
+        self._leaf_names_cache: Optional[List[str]] = None
+        self._height_cache: Optional[int] = None
     
     def merge(self, other: 'MergeNode', new_id: int, distance: float) -> 'MergeNode':
         """
@@ -62,29 +81,96 @@ class MergeNode:
         Returns:
             MergeNode: Nouveau noeud fusionné
         """
-        merged = MergeNode(new_id, self.files + other.files, distance)
+        # Taille cumulée des deux enfants: pas de nouvelle somme sur les fichiers
+        merged = MergeNode(new_id, [], distance,
+                           precomputed_total=self.total_size + other.total_size)
+        # Les fichiers restent portés par les feuilles
+        merged._files = None
         merged.left = self
         merged.right = other
         merged.is_leaf = False
         return merged
     
+    @property
+    def files(self) -> Iterator[SmallFile]:
+        """
+        Fichiers du noeud.
+        
+        Une feuille retourne sa liste; un noeud interne parcourt ses
+        feuilles de gauche à droite (itératif, sans copie).
+        """
+        if self._files is not None:
+            return self._files
+        return self._iter_files()
+    
+    def _iter_files(self) -> Iterator[SmallFile]:
+        """Générateur des fichiers des feuilles, de gauche à droite."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node._files is not None:
+                yield from node._files
+            else:
+                if node.right:
+                    stack.append(node.right)
+                if node.left:
+                    stack.append(node.left)
+    
     def get_height(self) -> int:
-        """Calcule la hauteur de l'arbre."""
-        if self.is_leaf:
-            return 1
-        left_height = self.left.get_height() if self.left else 0
-        right_height = self.right.get_height() if self.right else 0
-        return 1 + max(left_height, right_height)
+        """
+        Calcule la hauteur de l'arbre (mémorisée après le premier appel).
+        
+        Parcours itératif avec une pile explicite: pas de limite de
+        récursion sur les dendrogrammes profonds. Les sous-arbres dont la
+        hauteur est déjà connue ne sont pas reparcourus.
+        """
+        if self._height_cache is not None:
+            return self._height_cache
+        
+        height = 0
+        stack = [(self, 1)]
+        while stack:
+            node, depth = stack.pop()
+            if node._height_cache is not None:
+                depth += node._height_cache - 1
+            elif not node.is_leaf:
+                if node.left:
+                    stack.append((node.left, depth + 1))
+                if node.right:
+                    stack.append((node.right, depth + 1))
+            if depth > height:
+                height = depth
+        
+        self._height_cache = height
+        return height
     
     def get_leaf_names(self) -> List[str]:
-        """Obtient les noms de tous les fichiers feuilles."""
-        if self.is_leaf:
-            return [f.name for f in self.files]
+        """
+        Obtient les noms de tous les fichiers feuilles (mémorisés après le premier appel).
+        
+        Parcours en profondeur itératif (gauche puis droite), dans le même
+        ordre que le parcours récursif. La liste retournée est partagée avec
+        le cache et ne doit pas être modifiée.
+        """
+        if self._leaf_names_cache is not None:
+            return self._leaf_names_cache
+        
         names = []
-        if self.left:
-            names.extend(self.left.get_leaf_names())
-        if self.right:
-            names.extend(self.right.get_leaf_names())
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node._leaf_names_cache is not None:
+                names.extend(node._leaf_names_cache)
+            elif node._files is not None:
+                names.extend(f.name for f in node._files)
+            else:
+                # Empiler la droite d'abord pour visiter la gauche en premier
+                if node.right:
+                    stack.append(node.right)
+                if node.left:
+                    stack.append(node.left)
+        
+        self._leaf_names_cache = names
         return names
 
 
@@ -124,6 +210,11 @@ class Dendrogram:
         """
         self.merge_history.append((cluster_i_id, cluster_j_id, new_cluster_id, distance))
     
+    def reset(self) -> None:
+        """Vide l'arbre et l'historique (avant un nouveau clustering)."""
+        self.roots = []
+        self.merge_history = []
+    
     def build_from_clusters(self, final_clusters: List[Cluster]) -> None:
         """
         Construit le dendrogramme à partir des clusters finaux.
@@ -136,47 +227,108 @@ class Dendrogram:
             for cluster in final_clusters
         ]
     
+    def build_from_linkage(self, leaf_clusters: List[Cluster],
+                           linkage_matrix: List[Tuple[int, int, float, int]],
+                           final_clusters: List[Cluster],
+                           merged_ids: List[int]) -> None:
+        """
+        Construit l'arbre hiérarchique complet à partir des fusions.
+        
+        Le format suit scipy.cluster.hierarchy.linkage: la ligne k fusionne
+        les noeuds (noeud_i, noeud_j) et crée le noeud n + k, les feuilles
+        étant les n clusters initiaux. Chaque racine correspond à un
+        cluster final; le noeud interne k porte l'ID merged_ids[k] du
+        cluster créé par la fusion.
+        
+        Args:
+            leaf_clusters (List[Cluster]): Clusters initiaux (un fichier chacun)
+            linkage_matrix (List[Tuple[int, int, float, int]]): Fusions
+                (noeud_i, noeud_j, distance, nombre de fichiers)
+            final_clusters (List[Cluster]): Clusters finaux après fusion
+            merged_ids (List[int]): ID du cluster créé par chaque fusion,
+                aligné sur linkage_matrix
+                
+        Raises:
+            ValueError: Si merged_ids n'a pas une entrée par fusion
+        """
+        if len(merged_ids) != len(linkage_matrix):
+            raise ValueError(f"{len(merged_ids)} IDs de clusters pour "
+                             f"{len(linkage_matrix)} fusions")
+        
+        nodes = [MergeNode(cluster.cluster_id, cluster.files, 0.0)
+                 for cluster in leaf_clusters]
+        for k, (node_i, node_j, distance, _count) in enumerate(linkage_matrix):
+            nodes.append(nodes[node_i].merge(nodes[node_j], merged_ids[k], distance))
+        
+        # Les racines sont les noeuds des clusters finaux
+        node_by_id = {node.cluster_id: node for node in nodes}
+        self.roots = [node_by_id[cluster.cluster_id] for cluster in final_clusters]
+    
     def print_tree(self, node: Optional[MergeNode] = None, 
                    prefix: str = "", is_last: bool = True) -> None:
         """
         Affiche l'arbre hiérarchique en format texte.
         
+        Le texte est construit dans un tampon puis écrit en une seule fois
+        sur la sortie standard (pas d'appel à print par noeud).
+        
         Args:
             node (Optional[MergeNode]): Nœud à afficher
             prefix (str): Préfixe pour l'indentation
             is_last (bool): Si c'est le dernier enfant
         """
+        buf = io.StringIO()
+        write = buf.write
+        
         if node is None:
             # Afficher tous les arbres
-            print(f"\n{'='*70}")
-            print(f"DENDROGRAM - Structure Hiérarchique (selon article)")
-            print(f"{'='*70}\n")
+            write(f"\n{'='*70}\n")
+            write(f"DENDROGRAM - Structure Hiérarchique (selon article)\n")
+            write(f"{'='*70}\n\n")
             
             for i, root in enumerate(self.roots):
-                print(f"Arbre {i+1} (Cluster {root.cluster_id}):")
-                self.print_tree(root, "", True)
-                print()
-            return
+                write(f"Arbre {i+1} (Cluster {root.cluster_id}):\n")
+                self._format_tree(root, "", True, write)
+                write("\n")
+        else:
+            self._format_tree(node, prefix, is_last, write)
         
-        # Afficher le nœud actuel
-        connector = "└── " if is_last else "├── "
+        sys.stdout.write(buf.getvalue())
+    
+    @staticmethod
+    def _format_tree(node: MergeNode, prefix: str, is_last: bool,
+                     write: Callable[[str], int]) -> None:
+        """
+        Écrit un sous-arbre ligne par ligne (parcours itératif en préordre).
         
-        if node.is_leaf:
-            files_str = ", ".join([f.name for f in node.files[:3]])
-            if len(node.files) > 3:
-                files_str += f"... (+{len(node.files)-3})"
-            print(f"{prefix}{connector}Cluster {node.cluster_id} "
-                  f"({node.total_size:.1f}MB) [{files_str}]")
-        else:
-            print(f"{prefix}{connector}Cluster {node.cluster_id} "
-                  f"({node.total_size:.1f}MB) [distance={node.merge_distance:.1f}]")
+        Args:
+            node (MergeNode): Racine du sous-arbre
+            prefix (str): Préfixe pour l'indentation
+            is_last (bool): Si c'est le dernier enfant
+            write (Callable[[str], int]): Fonction d'écriture d'une ligne
+        """
+        stack = [(node, prefix, is_last)]
+        while stack:
+            node, prefix, is_last = stack.pop()
+            connector = "└── " if is_last else "├── "
             
-            # Afficher les enfants
-            new_prefix = prefix + ("    " if is_last else "│   ")
-            if node.left:
-                self.print_tree(node.left, new_prefix, False)
-            if node.right:
-                self.print_tree(node.right, new_prefix, True)
+            if node.is_leaf:
+                files = node.files
+                files_str = ", ".join([f.name for f in files[:3]])
+                if len(files) > 3:
+                    files_str += f"... (+{len(files)-3})"
+                write(f"{prefix}{connector}Cluster {node.cluster_id} "
+                      f"({node.total_size:.1f}MB) [{files_str}]\n")
+            else:
+                write(f"{prefix}{connector}Cluster {node.cluster_id} "
+                      f"({node.total_size:.1f}MB) [distance={node.merge_distance:.1f}]\n")
+                
+                # Enfants: droite empilée d'abord pour afficher la gauche en premier
+                new_prefix = prefix + ("    " if is_last else "│   ")
+                if node.right:
+                    stack.append((node.right, new_prefix, True))
+                if node.left:
+                    stack.append((node.left, new_prefix, False))
     
     def print_merge_history(self) -> None:
         """Affiche l'historique des fusions."""
@@ -204,9 +356,16 @@ class Dendrogram:
         if not self.roots:
             return {"total_trees": 0, "total_merges": 0}
         
+        # Une seule passe sur les racines, valeurs mémorisées sur chaque noeud
+        max_height = 0
+        total_leaves = 0
+        for root in self.roots:
+            max_height = max(max_height, root.get_height())
+            total_leaves += len(root.get_leaf_names())
+        
         return {
             "total_trees": len(self.roots),
             "total_merges": len(self.merge_history),
-            "max_height": max(root.get_height() for root in self.roots),
-            "total_leaves": sum(len(root.get_leaf_names()) for root in self.roots)
+            "max_height": max_height,
+            "total_leaves": total_leaves
         }
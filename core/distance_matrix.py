@@ -7,9 +7,16 @@ Selon l'article (Section 3 - Background Theory):
 - Formule: d(i,j) = |x_ip - x_jp| où x est la taille du fichier
 """
 
-from typing import List
+import heapq
+from array import array
+from bisect import bisect_left
+from itertools import repeat
+from operator import itemgetter
+from typing import List, Tuple
 from models.cluster import Cluster
 
+__all__ = ["DistanceMatrix"]
+
 
 class DistanceMatrix:
     """
@@ -24,7 +31,21 @@ class DistanceMatrix:
     
     Attributes:
         clusters (List[Cluster]): Liste des clusters actifs C = {C1, C2, ..., Cm}
-        matrix (List[List[float]]): Matrice de distance symétrique De
+        cond (array): Demi-matrice supérieure De en forme condensée (format
+            pdist de SciPy) sur les emplacements initiaux: d(a,b), a < b,
+            est à l'index N*a - a*(a+1)//2 + (b - a - 1), N = nombre initial
+            de clusters
+    
+    Une fusion ne déplace aucune distance: le cluster fusionné reprend
+    l'emplacement du premier cluster et seule sa colonne est mise à jour
+    (Lance-Williams en place, O(n) par fusion). self._slots associe à
+    chaque index de self.clusters son emplacement dans self.cond.
+    
+    La paire la plus proche est tenue dans un tas (distance, rang_i, rang_j),
+    où le rang est l'ordre de création du cluster: l'ordre des rangs est
+    celui des index dans self.clusters, le tas départage donc les égalités
+    comme le parcours ligne par ligne de la matrice. Les entrées d'un
+    cluster fusionné sont écartées paresseusement.
     """
     
     def __init__(self, clusters: List[Cluster]):
@@ -35,7 +56,19 @@ class DistanceMatrix:
             clusters (List[Cluster]): Liste initiale de clusters
         """
         self.clusters = clusters
-        self.matrix = []
+        # "Only the half of the matrix is needed because the distance
+        # between objects is symmetric": n(n-1)/2 flottants contigus
+        self.cond = array('d')
+        # Emplacement dans self.cond de chaque cluster (aligné sur self.clusters)
+        self._slots = list(range(len(clusters)))
+        self._n_slots = len(clusters)
+        # Rang de création de chaque cluster (croissant, aligné sur self.clusters)
+        self._ranks = list(range(len(clusters)))
+        self._next_rank = len(clusters)
+        self._heap = []
+        # Tailles des clusters, lues une seule fois puis tenues à jour à
+        # chaque fusion (alignées sur self.clusters)
+        self._sizes = [c.get_total_size() for c in clusters]
         self._compute_matrix()
     
     def _compute_matrix(self) -> None:
@@ -52,19 +85,73 @@ class DistanceMatrix:
         - d(1,2) = |40 - 10| = 30
         - d(1,3) = |40 - 50| = 10
         """
-        n = len(self.clusters)
-        self.matrix = [[0.0 for _ in range(n)] for _ in range(n)]
+        sizes = self._sizes
+        n = len(sizes)
+        
+        # Une seule passe par ligne: chaque distance De(Ci, Cj), j > i, est
+        # calculée une fois puis rangée dans la forme condensée et dans le
+        # tas (distance, rang_i, rang_j), rang_i < rang_j
+        cond = array('d')
+        heap = []
+        for i, size_i in enumerate(sizes):
+            row = [abs(size_i - size_j) for size_j in sizes[i + 1:]]
+            cond.extend(row)
+            heap.extend(zip(row, repeat(i), range(i + 1, n)))
+        heapq.heapify(heap)
+        
+        self.cond = cond
+        self._heap = heap
+    
+    def _position(self, slot_a: int, slot_b: int) -> int:
+        """
+        Index dans self.cond de la distance entre deux emplacements distincts.
         
-        for i in range(n):
-            for j in range(i + 1, n):
-                # Distance euclidienne: De(Ci, Cj) = |size(Ci) - size(Cj)|
-                size_i = self.clusters[i].get_total_size()
-                size_j = self.clusters[j].get_total_size()
-                distance = abs(size_i - size_j)
-                
-                # Matrice symétrique: d(i,j) = d(j,i)
-                self.matrix[i][j] = distance
-                self.matrix[j][i] = distance
+        Args:
+            slot_a (int): Premier emplacement
+            slot_b (int): Second emplacement
+            
+        Returns:
+            int: Position de d(slot_a, slot_b) dans la forme condensée
+        """
+        if slot_a > slot_b:
+            slot_a, slot_b = slot_b, slot_a
+        return self._n_slots * slot_a - slot_a * (slot_a + 1) // 2 + slot_b - slot_a - 1
+    
+    def _index_of(self, rank: int) -> int:
+        """
+        Index actuel dans self.clusters du cluster de rang donné.
+        
+        Args:
+            rank (int): Rang de création du cluster
+            
+        Returns:
+            int: Index du cluster, -1 s'il a été fusionné
+        """
+        ranks = self._ranks
+        index = bisect_left(ranks, rank)
+        if index < len(ranks) and ranks[index] == rank:
+            return index
+        return -1
+    
+    def _upper_row(self, i: int) -> List[float]:
+        """
+        Distances d(i, j) pour j > i, dans l'ordre des index de self.clusters.
+        
+        Args:
+            i (int): Index du cluster
+            
+        Returns:
+            List[float]: Ligne i de la demi-matrice supérieure
+        """
+        cond = self.cond
+        slot_i = self._slots[i]
+        # Emplacements supérieurs: ligne de slot_i, contiguë dans self.cond
+        base_row = self._n_slots * slot_i - slot_i * (slot_i + 1) // 2 - slot_i - 1
+        # Emplacements inférieurs: colonne slot_i de la ligne de slot_j
+        n_slots = self._n_slots
+        return [cond[base_row + slot_j] if slot_j > slot_i else
+                cond[n_slots * slot_j - slot_j * (slot_j + 1) // 2 + slot_i - slot_j - 1]
+                for slot_j in self._slots[i + 1:]]
     
     def find_closest_pair(self) -> tuple:
         """
@@ -80,36 +167,60 @@ class DistanceMatrix:
         if len(self.clusters) < 2:
             return None, None, float('inf')
         
-        min_distance = float('inf')
-        min_i, min_j = 0, 1
-        
-        n = len(self.clusters)
-        for i in range(n):
-            for j in range(i + 1, n):
-                if self.matrix[i][j] < min_distance:
-                    min_distance = self.matrix[i][j]
-                    min_i, min_j = i, j
-        
-        return min_i, min_j, min_distance
+        # Sommet du tas; les paires d'un cluster déjà fusionné sont retirées
+        heap = self._heap
+        index_of = self._index_of
+        while heap:
+            distance, rank_i, rank_j = heap[0]
+            i = index_of(rank_i)
+            if i >= 0:
+                j = index_of(rank_j)
+                if j >= 0:
+                    return i, j, distance
+            heapq.heappop(heap)
+        
+        return None, None, float('inf')
     
-    def get_all_pairs_sorted(self) -> list:
+    def get_all_pairs_sorted(self) -> Tuple[array, array, array]:
         """
         Retourne toutes les paires de clusters triées par distance.
         
+        Les paires sont rendues sous forme de trois tableaux parallèles
+        (module array) plutôt qu'une liste de tuples: aucun objet Python
+        n'est créé par paire.
+        
         Returns:
-            list: Liste de tuples (index_i, index_j, distance) triée par distance
+            Tuple[array, array, array]: (I, J, D) avec I[k] < J[k] les index
+                des clusters (entiers) et D[k] leur distance (flottants),
+                triés par distance croissante (tri stable)
         """
-        pairs = []
         n = len(self.clusters)
         
+        # Index (i, j) de chaque position de la demi-matrice supérieure
+        rows_i = array('i')
+        cols_j = array('i')
         for i in range(n):
-            for j in range(i + 1, n):
-                pairs.append((i, j, self.matrix[i][j]))
-        
-        # Trier par distance croissante
-        pairs.sort(key=lambda x: x[2])
-        
-        return pairs
+            rows_i.extend([i] * (n - i - 1))
+            cols_j.extend(range(i + 1, n))
+        
+        # Sans fusion, self.cond est déjà dans l'ordre des index actuels
+        if self._next_rank == self._n_slots:
+            distances = self.cond
+        else:
+            distances = array('d')
+            for i in range(n - 1):
+                distances.extend(self._upper_row(i))
+        
+        # Tri stable des positions par distance (argsort), puis regroupement
+        # des trois colonnes en C avec itemgetter
+        order = sorted(range(len(distances)), key=distances.__getitem__)
+        if len(order) < 2:
+            # itemgetter à moins de deux clés ne retourne pas un tuple
+            return (array('i', rows_i), array('i', cols_j), array('d', distances))
+        gather = itemgetter(*order)
+        return (array('i', gather(rows_i)),
+                array('i', gather(cols_j)),
+                array('d', gather(distances)))
     
     def merge_clusters(self, i: int, j: int) -> None:
         """
@@ -134,61 +245,42 @@ class DistanceMatrix:
         # Créer le nouveau cluster fusionné
         merged_cluster = self.clusters[i].merge_with(self.clusters[j])
         
-        # Calculer les nouvelles distances (single-linkage)
-        new_distances = []
-        n = len(self.clusters)
-        
-        for k in range(n):
-            if k == i or k == j:
-                new_distances.append(0.0)
-            else:
-                # Single-linkage: minimum des distances
-                dist = min(self.matrix[i][k], self.matrix[j][k])
-                new_distances.append(dist)
+        cond = self.cond
+        position = self._position
+        slot_i = self._slots[i]
+        slot_j = self._slots[j]
         
         # Supprimer les anciens clusters (supprimer j d'abord car j > i)
         del self.clusters[j]
         del self.clusters[i]
+        del self._slots[j]
+        del self._slots[i]
+        del self._ranks[j]
+        del self._ranks[i]
+        del self._sizes[j]
+        del self._sizes[i]
+        
+        # Mise à jour de Lance-Williams (single-linkage), en place:
+        # De(C ∪ C', Ck) = min(De(C, Ck), De(C', Ck))
+        # Le nouveau cluster reprend l'emplacement de Ci; celui de Cj est libéré
+        new_rank = self._next_rank
+        self._next_rank += 1
+        heap = self._heap
+        for slot_k, rank_k in zip(self._slots, self._ranks):
+            pos_i = position(slot_i, slot_k)
+            distance = cond[position(slot_j, slot_k)]
+            if distance < cond[pos_i]:
+                cond[pos_i] = distance
+            else:
+                distance = cond[pos_i]
+            # Nouvelle paire (distance, rang_k, rang du nouveau cluster)
+            heapq.heappush(heap, (distance, rank_k, new_rank))
         
-        # Ajouter le nouveau cluster
+        # Ajouter le nouveau cluster (dernière ligne/colonne)
         self.clusters.append(merged_cluster)
-        
-        # Reconstruire la matrice
-        self._rebuild_matrix_after_merge(i, j, new_distances)
-    
-    def _rebuild_matrix_after_merge(self, i: int, j: int, new_distances: List[float]) -> None:
-        """
-        Reconstruit la matrice après une fusion.
-        
-        Args:
-            i (int): Index du premier cluster fusionné
-            j (int): Index du second cluster fusionné
-            new_distances (List[float]): Distances du nouveau cluster aux autres
-        """
-        n_old = len(new_distances)
-        n_new = n_old - 2 + 1  # On enlève 2 clusters, on en ajoute 1
-        
-        # Créer une nouvelle matrice
-        new_matrix = [[0.0 for _ in range(n_new)] for _ in range(n_new)]
-        
-        # Copier les anciennes distances (en excluant i et j)
-        old_to_new = []
-        for k in range(n_old):
-            if k != i and k != j:
-                old_to_new.append(k)
-        
-        for row_idx, old_row in enumerate(old_to_new):
-            for col_idx, old_col in enumerate(old_to_new):
-                new_matrix[row_idx][col_idx] = self.matrix[old_row][old_col]
-        
-        # Ajouter les distances pour le nouveau cluster (dernière ligne/colonne)
-        new_cluster_idx = n_new - 1
-        for idx, k in enumerate(old_to_new):
-            dist = new_distances[k]
-            new_matrix[new_cluster_idx][idx] = dist
-            new_matrix[idx][new_cluster_idx] = dist
-        
-        self.matrix = new_matrix
+        self._slots.append(slot_i)
+        self._ranks.append(new_rank)
+        self._sizes.append(merged_cluster.get_total_size())
     
     def get_distance(self, i: int, j: int) -> float:
         """
@@ -201,7 +293,9 @@ class DistanceMatrix:
         Returns:
             float: Distance entre les clusters
         """
-        return self.matrix[i][j]
+        if i == j:
+            return 0.0
+        return self.cond[self._position(self._slots[i], self._slots[j])]
     
     def __len__(self) -> int:
         """
@@ -249,10 +343,10 @@ class DistanceMatrix:
                 elif j < i:
                     print("      ", end="")  # Partie inférieure (symétrique)
                 else:
-                    print(f"{self.matrix[i][j]:5.1f} ", end="")
+                    print(f"{self.get_distance(i, j):5.1f} ", end="")
             
             # Afficher la taille du cluster
-            size = self.clusters[i].get_total_size()
+            size = self._sizes[i]
             print(f"| ({size:.1f} MB)")
         
         print()
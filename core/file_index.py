@@ -3,10 +3,15 @@ Index pour la récupération de fichiers individuels depuis les clusters fusionn
 Permet de retrouver un fichier spécifique dans un fichier fusionné.
 """
 
+import mmap
+from array import array
+from itertools import accumulate
+from operator import sub
 from typing import Dict, List, Optional, Tuple
 from models.cluster import Cluster
 from models.small_file import SmallFile
 import os
+import sys
 
 
 class FileIndex:
@@ -16,16 +21,52 @@ class FileIndex:
     Selon l'article: "NameNode only maintains the metadata of merged files"
     Cet index permet de retrouver les fichiers originaux.
     
+    Les localisations sont stockées en colonnes (un tableau array par champ,
+    une ligne par fichier) plutôt qu'un tuple par fichier: l'index reste
+    compact pour des millions de petits fichiers.
+    
     Attributes:
-        index (Dict): Mapping filename -> (cluster_id, offset, size)
+        cluster_ids (array): ID du cluster de chaque ligne
+        offsets (array): Position de chaque fichier dans le fichier fusionné (bytes)
+        sizes (array): Taille de chaque fichier (bytes)
+        cluster_files (Dict[int, List[str]]): Fichiers de chaque cluster
     """
     
     def __init__(self):
         """Initialise l'index vide."""
-        self.index: Dict[str, Tuple[int, int, int]] = {}
+        self.cluster_ids = array('q')
+        self.offsets = array('q')
+        self.sizes = array('q')
+        # Nom de fichier -> ligne dans les tableaux
+        self._name_to_row: Dict[str, int] = {}
         self.cluster_files: Dict[int, List[str]] = {}
+        # Projections mémoire des fichiers fusionnés ouverts par extract_file:
+        # chemin -> (mmap, (st_mtime_ns, st_size) au moment de la projection)
+        self._mmap_cache: Dict[str, Tuple[mmap.mmap, Tuple[int, int]]] = {}
+    
+    @property
+    def index(self) -> Dict[str, Tuple[int, int, int]]:
+        """
+        Mapping filename -> (cluster_id, offset, size), reconstruit à la demande.
+        
+        Returns:
+            Dict[str, Tuple[int, int, int]]: Localisation de chaque fichier
+        """
+        return {name: self._location(row) for name, row in self._name_to_row.items()}
+    
+    def _location(self, row: int) -> Tuple[int, int, int]:
+        """
+        Localisation stockée à une ligne des tableaux.
+        
+        Args:
+            row (int): Ligne de l'index
+            
+        Returns:
+            Tuple[int, int, int]: (cluster_id, offset, size)
+        """
+        return self.cluster_ids[row], self.offsets[row], self.sizes[row]
     
-    def build_index(self, clusters: List[Cluster]) -> None:
+    def build_index(self, clusters: List[Cluster], source_dir: Optional[str] = None) -> None:
         """
         Construit l'index à partir des clusters.
         
@@ -36,32 +77,41 @@ class FileIndex:
         
         Args:
             clusters (List[Cluster]): Liste des clusters
+            source_dir (Optional[str]): Répertoire des fichiers réels concaténés
+                par FileMerger; les tailles sont alors lues sur le disque
+                (pas d'en-tête simulé)
         """
-        self.index.clear()
+        self.cluster_ids = array('q')
+        self.offsets = array('q')
+        self.sizes = array('q')
+        self._name_to_row.clear()
         self.cluster_files.clear()
         
         for cluster in clusters:
-            offset = 0
-            file_list = []
+            file_list = [file.name for file in cluster.files]
+            
+            if source_dir is not None:
+                # Fichiers réels: taille exacte sur le disque, sans en-tête
+                entry_sizes = [os.path.getsize(os.path.join(source_dir, name))
+                               for name in file_list]
+            else:
+                # Taille en bytes + en-tête "FILE: <nom>\n" (pour la simulation)
+                entry_sizes = [int(file.size_mb * 1024 * 1024)
+                               + len(f"FILE: {file.name}\n".encode('utf-8'))
+                               for file in cluster.files]
             
-            for file in cluster.files:
-                # Calculer la taille en bytes
-                size_bytes = int(file.size_mb * 1024 * 1024)
-                
-                # Ajouter l'en-tête du fichier (pour la simulation)
-                header = f"FILE: {file.name}\n".encode('utf-8')
-                header_size = len(header)
-                
-                # Stocker dans l'index: (cluster_id, offset, taille_totale)
-                self.index[file.name] = (cluster.cluster_id, offset, size_bytes + header_size)
-                file_list.append(file.name)
-                
-                # Mettre à jour l'offset pour le prochain fichier
-                offset += size_bytes + header_size
+            # Offsets = fin cumulée de chaque fichier moins sa taille (0 pour le premier)
+            row = len(self.offsets)
+            ends = accumulate(entry_sizes)
+            self.offsets.extend(map(sub, ends, entry_sizes))
+            self.sizes.extend(entry_sizes)
+            self.cluster_ids.extend([cluster.cluster_id] * len(file_list))
             
+            # Stocker dans l'index: nom -> ligne (cluster_id, offset, taille_totale)
+            self._name_to_row.update(zip(file_list, range(row, row + len(file_list))))
             self.cluster_files[cluster.cluster_id] = file_list
         
-        print(f"\n✓ Index construit: {len(self.index)} fichiers indexés dans {len(self.cluster_files)} clusters")
+        print(f"\n✓ Index construit: {len(self._name_to_row)} fichiers indexés dans {len(self.cluster_files)} clusters")
     
     def get_file_location(self, filename: str) -> Optional[Tuple[int, int, int]]:
         """
@@ -73,7 +123,10 @@ class FileIndex:
         Returns:
             Optional[Tuple[int, int, int]]: (cluster_id, offset, size) ou None
         """
-        return self.index.get(filename)
+        row = self._name_to_row.get(filename)
+        if row is None:
+            return None
+        return self._location(row)
     
     def extract_file(self, filename: str, merged_files_dir: str) -> Optional[bytes]:
         """
@@ -99,9 +152,8 @@ class FileIndex:
             return None
         
         try:
-            with open(merged_file_path, 'rb') as f:
-                f.seek(offset)
-                content = f.read(size)
+            mapped = self._get_mapping(merged_file_path)
+            content = mapped[offset:offset + size] if mapped is not None else b""
             
             print(f"✓ Fichier '{filename}' extrait du cluster {cluster_id} (offset: {offset}, size: {size} bytes)")
             return content
@@ -109,6 +161,47 @@ class FileIndex:
             print(f"✗ Erreur lors de l'extraction de '{filename}': {e}")
             return None
     
+    def _get_mapping(self, path: str) -> Optional[mmap.mmap]:
+        """
+        Projection mémoire (lecture seule) d'un fichier fusionné, mise en cache.
+        
+        Plusieurs extractions depuis le même cluster partagent la même
+        projection; elle est refaite si le fichier a été réécrit depuis.
+        
+        Args:
+            path (str): Chemin du fichier fusionné
+            
+        Returns:
+            Optional[mmap.mmap]: Projection du fichier, None s'il est vide
+        """
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._mmap_cache.get(path)
+        if cached is not None:
+            if cached[1] == signature:
+                return cached[0]
+            cached[0].close()
+            del self._mmap_cache[path]
+        
+        # Un fichier vide ne peut pas être projeté
+        if stat.st_size == 0:
+            return None
+        
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mmap_cache[path] = (mapped, signature)
+        return mapped
+    
+    def close(self) -> None:
+        """Libère les projections mémoire ouvertes par extract_file."""
+        for mapped, _ in self._mmap_cache.values():
+            mapped.close()
+        self._mmap_cache.clear()
+    
+    def __del__(self):
+        """Libère les projections mémoire restantes."""
+        self.close()
+    
     def list_files_in_cluster(self, cluster_id: int) -> List[str]:
         """
         Liste tous les fichiers contenus dans un cluster.
@@ -129,7 +222,7 @@ class FileIndex:
             dict: Statistiques sur l'index
         """
         return {
-            "total_files_indexed": len(self.index),
+            "total_files_indexed": len(self._name_to_row),
             "total_clusters": len(self.cluster_files),
             "files_per_cluster": {
                 cluster_id: len(files) 
@@ -138,17 +231,22 @@ class FileIndex:
         }
     
     def print_index(self) -> None:
-        """Affiche l'index complet."""
-        print(f"\n{'='*70}")
-        print(f"FILE INDEX - Mapping des fichiers vers clusters")
-        print(f"{'='*70}")
+        """
+        Affiche l'index complet.
+        
+        Les lignes sont assemblées puis écrites en une seule fois.
+        """
+        lines = [f"\n{'='*70}",
+                 f"FILE INDEX - Mapping des fichiers vers clusters",
+                 f"{'='*70}"]
         
         for cluster_id in sorted(self.cluster_files.keys()):
             files = self.cluster_files[cluster_id]
-            print(f"\nCluster {cluster_id} ({len(files)} fichiers):")
+            lines.append(f"\nCluster {cluster_id} ({len(files)} fichiers):")
             
             for filename in files:
-                cluster_id, offset, size = self.index[filename]
-                print(f"  - {filename:30s} | Offset: {offset:8d} bytes | Size: {size:8d} bytes")
+                _, offset, size = self.get_file_location(filename)
+                lines.append(f"  - {filename:30s} | Offset: {offset:8d} bytes | Size: {size:8d} bytes")
         
-        print(f"\n{'='*70}")
+        lines.append(f"\n{'='*70}")
+        sys.stdout.write("\n".join(lines) + "\n")
@@ -3,10 +3,21 @@ Classe pour fusionner physiquement les fichiers d'un cluster.
 """
 
 import os
-from typing import List
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, List, Optional
 from models.cluster import Cluster
 
 
+# Motif de remplissage des fichiers simulés (1 KB) et bloc d'écriture (1 MB)
+_PATTERN = b'X' * 1024
+_FILL_CHUNK = _PATTERN * 1024
+
+# Taille du tampon de copie quand os.sendfile n'est pas disponible (4 MB)
+_COPY_BUFFER_SIZE = 4 * 1024 * 1024
+
+
 class FileMerger:
     """
     Responsable de la fusion physique des fichiers dans un cluster.
@@ -16,16 +27,28 @@ class FileMerger:
     
     Attributes:
         output_dir (str): Répertoire où seront sauvegardés les fichiers fusionnés
+        source_dir (Optional[str]): Répertoire des fichiers réels à concaténer
+            (None: contenu simulé)
+        max_workers (Optional[int]): Nombre de threads d'écriture pour
+            merge_all_clusters (None: 2 par cœur, 1: séquentiel)
     """
     
-    def __init__(self, output_dir: str = "output"):
+    def __init__(self, output_dir: str = "output", source_dir: Optional[str] = None,
+                 max_workers: Optional[int] = None):
         """
         Initialise le FileMerger.
         
         Args:
             output_dir (str): Chemin du répertoire de sortie
+            source_dir (Optional[str]): Répertoire contenant les fichiers
+                originaux (nommés comme dans le cluster). Si None, le contenu
+                des fichiers est simulé.
+            max_workers (Optional[int]): Nombre de threads utilisés pour écrire
+                les clusters en parallèle (écritures disque: le GIL est relâché)
         """
         self.output_dir = output_dir
+        self.source_dir = source_dir
+        self.max_workers = max_workers
         self._ensure_output_dir()
     
     def _ensure_output_dir(self) -> None:
@@ -41,7 +64,8 @@ class FileMerger:
         Fusionne tous les fichiers d'un cluster en un seul fichier.
         
         Crée un fichier binaire nommé cluster_<id>.bin contenant
-        les données simulées de tous les fichiers du cluster.
+        les données de tous les fichiers du cluster: le contenu réel lu
+        dans source_dir s'il est défini, sinon des données simulées.
         
         Args:
             cluster (Cluster): Le cluster à fusionner
@@ -49,55 +73,121 @@ class FileMerger:
         Returns:
             str: Chemin du fichier fusionné créé
         """
-        output_filename = f"cluster_{cluster.cluster_id}.bin"
-        output_path = os.path.join(self.output_dir, output_filename)
+        output_path = self._write_cluster(cluster)
+        print(self._created_line(output_path))
+        return output_path
+    
+    def _write_cluster(self, cluster: Cluster) -> str:
+        """
+        Écrit le fichier fusionné d'un cluster, sans affichage.
+        
+        Args:
+            cluster (Cluster): Le cluster à fusionner
+            
+        Returns:
+            str: Chemin du fichier fusionné créé
+        """
+        output_path = os.path.join(self.output_dir, f"cluster_{cluster.cluster_id}.bin")
         
         # Créer un fichier binaire fusionné
         with open(output_path, 'wb') as merged_file:
             for file in cluster.files:
-                # Simuler le contenu du fichier
-                # Dans un vrai système, on lirait les fichiers réels
-                file_data = self._simulate_file_content(file.name, file.size_mb)
-                merged_file.write(file_data)
+                if self.source_dir is not None:
+                    # Concaténer le fichier réel (copie côté noyau si possible)
+                    source_path = os.path.join(self.source_dir, file.name)
+                    self._copy_source_file(merged_file, source_path)
+                else:
+                    # Simuler le contenu du fichier, écrit directement par blocs
+                    self._write_simulated_content(merged_file, file.name, file.size_mb)
         
+        return output_path
+    
+    @staticmethod
+    def _created_line(output_path: str) -> str:
+        """
+        Ligne de compte rendu: nom et taille réelle d'un fichier fusionné.
+        
+        Args:
+            output_path (str): Chemin du fichier fusionné
+            
+        Returns:
+            str: Ligne à afficher
+        """
         actual_size_mb = os.path.getsize(output_path) / (1024 * 1024)
-        print(f"  → Fichier créé: {output_filename} ({actual_size_mb:.2f} MB)")
+        return f"  → Fichier créé: {os.path.basename(output_path)} ({actual_size_mb:.2f} MB)"
+    
+    def _copy_source_file(self, out: BinaryIO, source_path: str) -> None:
+        """
+        Ajoute le contenu d'un fichier réel à la fin du fichier fusionné.
         
-        return output_path
+        Sous Linux, os.sendfile copie les données directement dans le noyau
+        (pas de passage par un tampon Python). Sinon, ou si le système
+        refuse sendfile pour ces fichiers, shutil.copyfileobj est utilisé
+        avec un tampon de 4 MB.
+        
+        Args:
+            out (BinaryIO): Fichier fusionné ouvert en écriture binaire
+            source_path (str): Chemin du fichier original
+        """
+        with open(source_path, 'rb') as src:
+            if hasattr(os, 'sendfile'):
+                # Vider le tampon Python avant d'écrire directement sur le descripteur
+                out.flush()
+                size = os.fstat(src.fileno()).st_size
+                offset = 0
+                try:
+                    while offset < size:
+                        sent = os.sendfile(out.fileno(), src.fileno(), offset, size - offset)
+                        if sent == 0:
+                            break
+                        offset += sent
+                    return
+                except OSError:
+                    if offset:
+                        raise
+            shutil.copyfileobj(src, out, _COPY_BUFFER_SIZE)
     
-    def _simulate_file_content(self, filename: str, size_mb: float) -> bytes:
+    def _write_simulated_content(self, out: BinaryIO, filename: str,
+                                 size_mb: float) -> None:
         """
-        Simule le contenu d'un fichier.
+        Écrit le contenu simulé d'un fichier dans le fichier fusionné.
         
-        Crée des données binaires simulées pour représenter un fichier.
+        Crée des données binaires simulées pour représenter un fichier:
+        un en-tête avec le nom du fichier puis un motif répété. Le contenu
+        est écrit par blocs de 1 MB, sans construire le fichier en mémoire.
         Dans un système réel, on lirait le vrai contenu du fichier.
         
         Args:
+            out (BinaryIO): Fichier fusionné ouvert en écriture binaire
             filename (str): Nom du fichier
             size_mb (float): Taille souhaitée en MB
-            
-        Returns:
-            bytes: Données binaires simulées
         """
         # Calculer le nombre d'octets
         num_bytes = int(size_mb * 1024 * 1024)
         
         # Créer un en-tête avec le nom du fichier
         header = f"FILE: {filename}\n".encode('utf-8')
-        
-        # Remplir avec des données (répétition d'un pattern)
-        pattern = b'X' * 1024  # 1 KB de données
-        num_patterns = (num_bytes - len(header)) // len(pattern)
-        remainder = (num_bytes - len(header)) % len(pattern)
-        
-        content = header + (pattern * num_patterns) + (pattern[:remainder])
-        
-        return content
+        out.write(header)
+        
+        # Remplir avec des données (répétition d'un pattern de 1 KB)
+        num_patterns = (num_bytes - len(header)) // len(_PATTERN)
+        remainder = (num_bytes - len(header)) % len(_PATTERN)
+        fill = max(num_patterns, 0) * len(_PATTERN) + remainder
+        
+        chunk = memoryview(_FILL_CHUNK)
+        while fill > 0:
+            written = min(fill, len(chunk))
+            out.write(chunk[:written])
+            fill -= written
     
     def merge_all_clusters(self, clusters: List[Cluster]) -> List[str]:
         """
         Fusionne tous les clusters en fichiers séparés.
         
+        Les fichiers sont écrits en parallèle par un pool de threads (travail
+        limité par les entrées/sorties); l'affichage est ensuite produit dans
+        l'ordre des clusters.
+        
         Args:
             clusters (List[Cluster]): Liste des clusters à fusionner
             
@@ -109,20 +199,29 @@ class FileMerger:
         print(f"{'='*60}")
         print(f"Nombre de clusters à fusionner: {len(clusters)}")
         
-        merged_files = []
-        
-        for idx, cluster in enumerate(clusters, 1):
-            print(f"\nCluster {cluster.cluster_id} ({len(cluster.files)} fichiers, "
-                  f"{cluster.get_total_size():.2f} MB):")
-            
-            output_path = self.merge_cluster(cluster)
-            merged_files.append(output_path)
-        
-        print(f"\n{'='*60}")
-        print(f"FUSION TERMINÉE")
-        print(f"{'='*60}")
-        print(f"Fichiers créés: {len(merged_files)}")
-        print(f"Répertoire: {self.output_dir}")
+        max_workers = self.max_workers
+        if max_workers is None:
+            max_workers = min(len(clusters), (os.cpu_count() or 1) * 2)
+        
+        if max_workers > 1 and len(clusters) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                merged_files = list(pool.map(self._write_cluster, clusters))
+        else:
+            merged_files = [self._write_cluster(cluster) for cluster in clusters]
+        
+        # Compte rendu assemblé puis écrit en une seule fois
+        lines = []
+        for cluster, output_path in zip(clusters, merged_files):
+            lines.append(f"\nCluster {cluster.cluster_id} ({len(cluster.files)} fichiers, "
+                         f"{cluster.get_total_size():.2f} MB):")
+            lines.append(self._created_line(output_path))
+        
+        lines.append(f"\n{'='*60}")
+        lines.append(f"FUSION TERMINÉE")
+        lines.append(f"{'='*60}")
+        lines.append(f"Fichiers créés: {len(merged_files)}")
+        lines.append(f"Répertoire: {self.output_dir}")
+        sys.stdout.write("\n".join(lines) + "\n")
         
         return merged_files
     
@@ -14,13 +14,92 @@ Selon l'article (Section 5 - Evaluation):
 - Exemple: 6 fichiers = 900 bytes, 2 clusters = 300 bytes (réduction 66.7%)
 """
 
-from typing import List
+from functools import lru_cache
+from typing import List, NamedTuple, Tuple
 from models.cluster import Cluster
 from models.small_file import SmallFile
 
 
 # Constante selon l'article de recherche
-METADATA_BYTES_PER_FILE = 150
+METADATA_BYTES_PER_FILE: int = 150
+
+# Gabarit du rapport mémoire, rempli avec le MemoryReduction retourné par
+# calculate_memory_reduction (accès aux champs par attribut)
+_SEPARATOR: str = '=' * 70
+_REPORT_TEMPLATE: str = f"""
+{_SEPARATOR}
+NAMENODE MEMORY CONSUMPTION ANALYSIS (selon article de recherche)
+{_SEPARATOR}
+
+Configuration:
+  Métadonnées par entrée: {{stats.metadata_size_per_entry}} bytes
+
+Système HDFS Original:
+  Nombre de fichiers: {{stats.original_files}}
+  Mémoire requise: {{stats.original_memory_bytes}} bytes
+  Formule: {{stats.original_files}} fichiers × {{stats.metadata_size_per_entry}} bytes
+
+Système Proposé (Après Fusion):
+  Nombre de clusters: {{stats.merged_clusters}}
+  Mémoire requise: {{stats.merged_memory_bytes}} bytes
+  Formule: {{stats.merged_clusters}} clusters × {{stats.metadata_size_per_entry}} bytes
+
+Réduction:
+  Mémoire économisée: {{stats.memory_saved_bytes}} bytes
+  Pourcentage de réduction: {{stats.reduction_percentage}}%
+  
+{_SEPARATOR}
+"""
+
+class MemoryReduction(NamedTuple):
+    """
+    Statistiques de réduction mémoire (résultat de calculate_memory_reduction).
+    
+    Attributes:
+        original_files (int): Nombre de fichiers originaux
+        merged_clusters (int): Nombre de clusters après fusion
+        original_memory_bytes (int): Mémoire NameNode avant fusion
+        merged_memory_bytes (int): Mémoire NameNode après fusion
+        memory_saved_bytes (int): Mémoire économisée
+        reduction_percentage (float): Pourcentage de réduction (arrondi à 2 décimales)
+        metadata_size_per_entry (int): Taille des métadonnées par entrée
+    """
+    original_files: int
+    merged_clusters: int
+    original_memory_bytes: int
+    merged_memory_bytes: int
+    memory_saved_bytes: int
+    reduction_percentage: float
+    metadata_size_per_entry: int
+
+
+@lru_cache(maxsize=1024)
+def _reduction(original_files_count: int, clusters_count: int,
+               metadata_size_bytes: int) -> MemoryReduction:
+    """
+    Calcul de la réduction mémoire, mémoïsé.
+    
+    Fonction pure de ses trois arguments (le résultat est un tuple
+    immuable): les mêmes comptes reviennent d'un rapport à l'autre.
+    """
+    original_memory = original_files_count * metadata_size_bytes
+    merged_memory = clusters_count * metadata_size_bytes
+    memory_saved = original_memory - merged_memory
+    reduction_percentage: float = (memory_saved / original_memory * 100) if original_memory > 0 else 0
+    
+    return MemoryReduction(
+        original_files=original_files_count,
+        merged_clusters=clusters_count,
+        original_memory_bytes=original_memory,
+        merged_memory_bytes=merged_memory,
+        memory_saved_bytes=memory_saved,
+        reduction_percentage=round(reduction_percentage, 2),
+        metadata_size_per_entry=metadata_size_bytes
+    )
+
+
+# Unités de format_bytes, de la plus grande à la plus petite
+_BYTE_UNITS: Tuple[Tuple[int, str], ...] = ((1024 * 1024, "MB"), (1024, "KB"))
 
 
 class NameNodeMemory:
@@ -40,14 +119,14 @@ class NameNodeMemory:
         metadata_size_bytes (int): Taille métadonnées/entrée (150 bytes)
     """
     
-    def __init__(self, metadata_size_bytes: int = METADATA_BYTES_PER_FILE):
+    def __init__(self, metadata_size_bytes: int = METADATA_BYTES_PER_FILE) -> None:
         """
         Initialise le simulateur de mémoire NameNode.
         
         Args:
             metadata_size_bytes (int): Taille des métadonnées en bytes (défaut: 150)
         """
-        self.metadata_size_bytes = metadata_size_bytes
+        self.metadata_size_bytes: int = metadata_size_bytes
     
     def calculate_original_memory(self, files: List[SmallFile]) -> int:
         """
@@ -77,7 +156,7 @@ class NameNodeMemory:
         return len(clusters) * self.metadata_size_bytes
     
     def calculate_memory_reduction(self, original_files_count: int, 
-                                   clusters_count: int) -> dict:
+                                   clusters_count: int) -> MemoryReduction:
         """
         Calcule la réduction de mémoire entre système original et proposé.
         
@@ -86,22 +165,10 @@ class NameNodeMemory:
             clusters_count (int): Nombre de clusters après fusion
             
         Returns:
-            dict: Statistiques de réduction mémoire
+            MemoryReduction: Statistiques de réduction mémoire (tuple nommé,
+                             _asdict() pour obtenir un dictionnaire)
         """
-        original_memory = original_files_count * self.metadata_size_bytes
-        merged_memory = clusters_count * self.metadata_size_bytes
-        memory_saved = original_memory - merged_memory
-        reduction_percentage = (memory_saved / original_memory * 100) if original_memory > 0 else 0
-        
-        return {
-            "original_files": original_files_count,
-            "merged_clusters": clusters_count,
-            "original_memory_bytes": original_memory,
-            "merged_memory_bytes": merged_memory,
-            "memory_saved_bytes": memory_saved,
-            "reduction_percentage": round(reduction_percentage, 2),
-            "metadata_size_per_entry": self.metadata_size_bytes
-        }
+        return _reduction(original_files_count, clusters_count, self.metadata_size_bytes)
     
     def get_detailed_report(self, files: List[SmallFile], 
                            clusters: List[Cluster]) -> str:
@@ -117,31 +184,7 @@ class NameNodeMemory:
         """
         stats = self.calculate_memory_reduction(len(files), len(clusters))
         
-        report = f"""
-{'='*70}
-NAMENODE MEMORY CONSUMPTION ANALYSIS (selon article de recherche)
-{'='*70}
-
-Configuration:
-  Métadonnées par entrée: {self.metadata_size_bytes} bytes
-
-Système HDFS Original:
-  Nombre de fichiers: {stats['original_files']}
-  Mémoire requise: {stats['original_memory_bytes']} bytes
-  Formule: {stats['original_files']} fichiers × {self.metadata_size_bytes} bytes
-
-Système Proposé (Après Fusion):
-  Nombre de clusters: {stats['merged_clusters']}
-  Mémoire requise: {stats['merged_memory_bytes']} bytes
-  Formule: {stats['merged_clusters']} clusters × {self.metadata_size_bytes} bytes
-
-Réduction:
-  Mémoire économisée: {stats['memory_saved_bytes']} bytes
-  Pourcentage de réduction: {stats['reduction_percentage']}%
-  
-{'='*70}
-"""
-        return report
+        return _REPORT_TEMPLATE.format(stats=stats)
     
     @staticmethod
     def format_bytes(bytes_value: int) -> str:
@@ -154,9 +197,7 @@ Réduction:
         Returns:
             str: Valeur formatée (bytes, KB, MB)
         """
-        if bytes_value < 1024:
-            return f"{bytes_value} bytes"
-        elif bytes_value < 1024 * 1024:
-            return f"{bytes_value / 1024:.2f} KB"
-        else:
-            return f"{bytes_value / (1024 * 1024):.2f} MB"
+        for factor, unit in _BYTE_UNITS:
+            if bytes_value >= factor:
+                return f"{bytes_value / factor:.2f} {unit}"
+        return f"{bytes_value} bytes"
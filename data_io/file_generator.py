@@ -3,6 +3,8 @@ Classe pour générer une liste de petits fichiers de test.
 """
 
 import random
+import sys
+from array import array
 from typing import List
 from models.small_file import SmallFile
 
@@ -18,9 +20,14 @@ class FileGenerator:
         min_size_mb (float): Taille minimale d'un fichier en MB
         max_size_mb (float): Taille maximale d'un fichier en MB
         seed (int): Graine pour la génération aléatoire (reproductibilité)
+        verbose (bool): Affiche le résumé de chaque génération
+        last_names (List[str]): Noms du dernier lot généré
+        last_sizes (array): Tailles (MB) du dernier lot généré, contiguës et
+            alignées sur last_names (vue en colonnes, sans objet par fichier)
     """
     
-    def __init__(self, min_size_mb: float = 0.5, max_size_mb: float = 50.0, seed: int = None):
+    def __init__(self, min_size_mb: float = 0.5, max_size_mb: float = 50.0, seed: int = None,
+                 verbose: bool = True):
         """
         Initialise le générateur de fichiers.
         
@@ -28,13 +35,18 @@ class FileGenerator:
             min_size_mb (float): Taille minimale en MB
             max_size_mb (float): Taille maximale en MB
             seed (int): Graine aléatoire (None = aléatoire)
+            verbose (bool): Affiche le résumé de chaque génération (défaut: True)
         """
         self.min_size_mb = min_size_mb
         self.max_size_mb = max_size_mb
         self.seed = seed
+        self.verbose = verbose
+        self.last_names: List[str] = []
+        self.last_sizes = array('d')
         
-        if seed is not None:
-            random.seed(seed)
+        # Générateur propre à l'instance (pas d'effet de bord sur le module
+        # random); seed=None l'initialise à partir du système
+        self._rng = random.Random(seed)
     
     def generate(self, num_files: int, prefix: str = "file") -> List[SmallFile]:
         """
@@ -47,30 +59,44 @@ class FileGenerator:
         Returns:
             List[SmallFile]: Liste de fichiers générés
         """
-        files = []
-        
-        for i in range(1, num_files + 1):
-            # Générer une taille aléatoire
-            size = random.uniform(self.min_size_mb, self.max_size_mb)
-            size = round(size, 2)
-            
-            # Créer le nom du fichier
-            name = f"{prefix}_{i:04d}.dat"
-            
-            # Créer le fichier
-            file = SmallFile(name, size)
-            files.append(file)
-        
-        print(f"\n{'='*60}")
-        print(f"GÉNÉRATION DE FICHIERS DE TEST")
-        print(f"{'='*60}")
-        print(f"Nombre de fichiers générés: {num_files}")
-        print(f"Taille minimale: {self.min_size_mb} MB")
-        print(f"Taille maximale: {self.max_size_mb} MB")
-        print(f"Taille totale: {sum(f.size_mb for f in files):.2f} MB")
+        # Tirer toutes les tailles d'un coup: même suite que random.uniform
+        # (a + (b - a) * random()), sans appel de méthode par fichier
+        rand = self._rng.random
+        low = self.min_size_mb
+        span = self.max_size_mb - self.min_size_mb
+        sizes = [round(low + span * rand(), 2) for _ in range(num_files)]
+        
+        # Noms des fichiers (gabarit formaté une fois) puis création des fichiers
+        names = self._numbered_names(prefix, num_files)
+        files = list(map(SmallFile, names, sizes))
+        self.last_names = names
+        self.last_sizes = array('d', sizes)
+        
+        if self.verbose:
+            lines = [f"\n{'='*60}",
+                     f"GÉNÉRATION DE FICHIERS DE TEST",
+                     f"{'='*60}",
+                     f"Nombre de fichiers générés: {num_files}",
+                     f"Taille minimale: {self.min_size_mb} MB",
+                     f"Taille maximale: {self.max_size_mb} MB",
+                     f"Taille totale: {sum(self.last_sizes):.2f} MB"]
+            sys.stdout.write("\n".join(lines) + "\n")
         
         return files
     
+    @staticmethod
+    def _numbered_names(prefix: str, count: int) -> List[str]:
+        """
+        Noms "{prefix}_0001.dat", "{prefix}_0002.dat", ... (numérotés à partir de 1).
+        
+        Le préfixe est intégré une seule fois au gabarit; seul le numéro est
+        formaté pour chaque fichier. Les noms sont internés: chaque lot
+        généré avec le même préfixe réutilise les mêmes chaînes, et les
+        recherches par nom (dict, set) se résolvent par identité.
+        """
+        template = (prefix.replace("{", "{{").replace("}", "}}") + "_{:04d}.dat").format
+        return list(map(sys.intern, map(template, range(1, count + 1))))
+    
     def generate_with_distribution(self, distribution: dict) -> List[SmallFile]:
         """
         Génère des fichiers selon une distribution spécifique.
@@ -82,23 +108,21 @@ class FileGenerator:
         Returns:
             List[SmallFile]: Liste de fichiers générés
         """
-        files = []
-        file_counter = 1
-        
-        for size_mb, count in distribution.items():
-            for _ in range(count):
-                name = f"file_{file_counter:04d}.dat"
-                file = SmallFile(name, size_mb)
-                files.append(file)
-                file_counter += 1
-        
-        print(f"\n{'='*60}")
-        print(f"GÉNÉRATION DE FICHIERS AVEC DISTRIBUTION")
-        print(f"{'='*60}")
-        print(f"Distribution:")
-        for size, count in distribution.items():
-            print(f"  {size} MB: {count} fichiers")
-        print(f"Total: {len(files)} fichiers, {sum(f.size_mb for f in files):.2f} MB")
+        # Tailles selon la distribution, puis noms numérotés à partir de 1
+        sizes = [size_mb for size_mb, count in distribution.items() for _ in range(count)]
+        names = self._numbered_names("file", len(sizes))
+        files = list(map(SmallFile, names, sizes))
+        self.last_names = names
+        self.last_sizes = array('d', sizes)
+        
+        if self.verbose:
+            lines = [f"\n{'='*60}",
+                     f"GÉNÉRATION DE FICHIERS AVEC DISTRIBUTION",
+                     f"{'='*60}",
+                     f"Distribution:"]
+            lines.extend([f"  {size} MB: {count} fichiers" for size, count in distribution.items()])
+            lines.append(f"Total: {len(files)} fichiers, {sum(self.last_sizes):.2f} MB")
+            sys.stdout.write("\n".join(lines) + "\n")
         
         return files
     
@@ -157,14 +181,17 @@ class FileGenerator:
         """
         Affiche un échantillon de fichiers.
         
+        Les lignes sont assemblées puis écrites en une seule fois.
+        
         Args:
             files (List[SmallFile]): Liste de fichiers
             max_display (int): Nombre maximum de fichiers à afficher
         """
-        print(f"\nÉchantillon de fichiers (affichant {min(max_display, len(files))} sur {len(files)}):")
-        
-        for i, file in enumerate(files[:max_display], 1):
-            print(f"  {i}. {file}")
+        lines = [f"\nÉchantillon de fichiers (affichant {min(max_display, len(files))} sur {len(files)}):"]
+        line = "  {}. {} ({:.2f} MB)".format
+        lines.extend([line(i, file.name, file.size_mb) for i, file in enumerate(files[:max_display], 1)])
         
         if len(files) > max_display:
-            print(f"  ... et {len(files) - max_display} autres fichiers")
+            lines.append(f"  ... et {len(files) - max_display} autres fichiers")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
@@ -2,10 +2,124 @@
 Classe pour écrire les métadonnées des clusters au format JSON.
 """
 
+import io
 import json
+import math
 import os
-from typing import List
+import tarfile
+from operator import attrgetter
+from typing import Callable, List, Optional, Sequence
 from models.cluster import Cluster
+from models.small_file import SmallFile
+
+
+# Encodeur JSON partagé (indentation 2, caractères accentués conservés)
+_JSON_ENCODER: json.JSONEncoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+# Nombre maximal de tampons par appel os.writev
+_IOV_MAX: int
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = -1
+if _IOV_MAX <= 0:
+    _IOV_MAX = 1024
+
+# Échappement des chaînes JSON avec ensure_ascii=False (version C si disponible)
+_encode_string: Callable[[str], str] = json.encoder.encode_basestring
+
+# Lecture du nom d'un fichier (map sans fonction Python par élément)
+_get_name: Callable[[SmallFile], str] = attrgetter('name')
+
+
+def _json_number(value: float) -> str:
+    """Nombre au format de json.dumps (repr, NaN/Infinity pour les non finis)."""
+    if isinstance(value, float):
+        return float.__repr__(value) if math.isfinite(value) else _JSON_ENCODER.encode(value)
+    return int.__repr__(value)
+
+
+def _cluster_json(cluster: Cluster) -> str:
+    """
+    Document JSON des métadonnées d'un cluster.
+    
+    Texte identique à json.dumps(cluster.to_dict(), indent=2,
+    ensure_ascii=False), écrit directement à partir des attributs du
+    cluster: ni dictionnaire intermédiaire ni parcours générique de
+    l'encodeur. Doit suivre la forme de Cluster.to_dict().
+    
+    Args:
+        cluster (Cluster): Le cluster à encoder
+        
+    Returns:
+        str: Document JSON (indentation 2)
+    """
+    files = cluster.files
+    if files:
+        names = ",\n    ".join(map(_encode_string, map(_get_name, files)))
+        files_json = f"[\n    {names}\n  ]"
+    else:
+        files_json = "[]"
+    
+    return (f'{{\n  "cluster_id": {_json_number(cluster.cluster_id)},\n'
+            f'  "files": {files_json},\n'
+            f'  "file_count": {len(files)},\n'
+            f'  "size_total_mb": {_json_number(round(cluster.get_total_size(), 2))}\n}}')
+
+
+def _cluster_documents(clusters: List[Cluster]) -> List[str]:
+    """
+    Documents JSON de tous les clusters (voir _cluster_json).
+    
+    L'encodage reste dans ce processus: transmettre un cluster à un
+    processus auxiliaire (pickle) coûte plus cher que de l'encoder.
+    """
+    return [_cluster_json(cluster) for cluster in clusters]
+
+
+def _write_text(path: str, text: str) -> None:
+    """
+    Écrit un document déjà encodé en un seul appel write.
+    
+    Args:
+        path (str): Chemin du fichier
+        text (str): Contenu du fichier (UTF-8)
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def _write_parts(path: str, parts: List[str]) -> None:
+    """
+    Écrit les fragments parts à la suite, sans les concaténer.
+    
+    Sous POSIX, les fragments sont transmis par os.writev (jusqu'à
+    _IOV_MAX tampons par appel système), sans passer par la pile io de
+    Python. Ailleurs (Windows), le document est écrit en mode texte comme
+    par _write_text.
+    
+    Args:
+        path (str): Chemin du fichier
+        parts (List[str]): Fragments du document, dans l'ordre
+    """
+    if not hasattr(os, "writev"):
+        _write_text(path, "".join(parts))
+        return
+    
+    buffers: List[memoryview] = [memoryview(part.encode('utf-8')) for part in parts if part]
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        start = 0
+        while start < len(buffers):
+            written = os.writev(fd, buffers[start:start + _IOV_MAX])
+            # Écriture partielle possible: avancer d'autant d'octets
+            while written and written >= len(buffers[start]):
+                written -= len(buffers[start])
+                start += 1
+            if written:
+                buffers[start] = buffers[start][written:]
+    finally:
+        os.close(fd)
 
 
 class MetadataWriter:
@@ -19,53 +133,102 @@ class MetadataWriter:
         output_dir (str): Répertoire où seront sauvegardés les fichiers de métadonnées
     """
     
-    def __init__(self, output_dir: str = "output"):
+    def __init__(self, output_dir: str = "output") -> None:
         """
         Initialise le MetadataWriter.
         
         Args:
             output_dir (str): Chemin du répertoire de sortie
         """
-        self.output_dir = output_dir
+        self.output_dir: str = output_dir
+        # Préfixe des chemins de sortie (répertoire + séparateur), joint une fois
+        self._out_prefix: str = os.path.join(output_dir, "")
         self._ensure_output_dir()
     
     def _ensure_output_dir(self) -> None:
         """
         Crée le répertoire de sortie s'il n'existe pas.
+        
+        Un seul appel (pas de test d'existence préalable): pas de course
+        si le répertoire est créé entre-temps par une autre exécution.
         """
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
+        os.makedirs(self.output_dir, exist_ok=True)
     
-    def write_cluster_metadata(self, cluster: Cluster, filename: str = None) -> str:
+    def write_cluster_metadata(self, cluster: Cluster, filename: Optional[str] = None) -> str:
         """
         Écrit les métadonnées d'un cluster dans un fichier JSON.
         
         Args:
             cluster (Cluster): Le cluster dont on veut écrire les métadonnées
-            filename (str): Nom du fichier (optionnel)
+            filename (Optional[str]): Nom du fichier (optionnel)
             
         Returns:
             str: Chemin du fichier créé
         """
         if filename is None:
-            filename = f"cluster_{cluster.cluster_id}_metadata.json"
+            filename = self._cluster_metadata_filename(cluster)
         
-        output_path = os.path.join(self.output_dir, filename)
+        output_path = self._out_prefix + filename
         
-        metadata = cluster.to_dict()
+        _write_text(output_path, _cluster_json(cluster))
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        return output_path
+    
+    @staticmethod
+    def _cluster_metadata_filename(cluster: Cluster) -> str:
+        """Nom du fichier de métadonnées individuel d'un cluster."""
+        return f"cluster_{cluster.cluster_id}_metadata.json"
+    
+    def write_clusters_archive(self, clusters: List[Cluster], archive_filename: str,
+                               documents: Optional[List[str]] = None) -> str:
+        """
+        Écrit les métadonnées individuelles de tous les clusters dans une archive tar.
+        
+        Chaque cluster donne le même document JSON que write_cluster_metadata,
+        mais tous sont regroupés dans un seul fichier: une ouverture et une
+        entrée de répertoire au lieu d'une par cluster (le problème des
+        petits fichiers que ce projet traite).
+        
+        Args:
+            clusters (List[Cluster]): Liste des clusters
+            archive_filename (str): Nom de l'archive (ex: "clusters_metadata.tar")
+            documents (Optional[List[str]]): Documents JSON déjà encodés
+                (alignés sur clusters)
+            
+        Returns:
+            str: Chemin de l'archive créée
+        """
+        output_path = os.path.join(self.output_dir, archive_filename)
+        
+        if documents is None:
+            documents = _cluster_documents(clusters)
+        
+        with tarfile.open(output_path, "w") as tar:
+            for cluster, document in zip(clusters, documents):
+                data = document.encode('utf-8')
+                info = tarfile.TarInfo(self._cluster_metadata_filename(cluster))
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
         
         return output_path
     
-    def write_all_metadata(self, clusters: List[Cluster], summary_filename: str = "clusters_summary.json") -> str:
+    def write_all_metadata(self, clusters: List[Cluster], summary_filename: str = "clusters_summary.json",
+                           archive_filename: Optional[str] = None,
+                           write_individual: bool = False) -> str:
         """
         Écrit les métadonnées de tous les clusters dans un fichier unique.
         
+        Par défaut, seul le fichier de synthèse est créé: un fichier JSON par
+        cluster recréerait le problème des petits fichiers que la fusion
+        cherche à éviter.
+        
         Args:
             clusters (List[Cluster]): Liste des clusters
             summary_filename (str): Nom du fichier de synthèse
+            archive_filename (Optional[str]): Si fourni, les métadonnées
+                individuelles sont aussi regroupées dans cette archive tar
+            write_individual (bool): Écrit en plus un fichier JSON par
+                cluster (défaut: False)
             
         Returns:
             str: Chemin du fichier créé
@@ -76,34 +239,58 @@ class MetadataWriter:
         
         output_path = os.path.join(self.output_dir, summary_filename)
         
-        # Créer un dictionnaire avec toutes les métadonnées
-        all_metadata = {
-            "total_clusters": len(clusters),
-            "clusters": [cluster.to_dict() for cluster in clusters],
-            "summary": self._generate_summary(clusters)
-        }
+        # Le document de chaque cluster est encodé une seule fois, puis
+        # réutilisé par la synthèse et les métadonnées individuelles
+        documents = _cluster_documents(clusters)
+        sizes = [cluster.get_total_size() for cluster in clusters]
+        summary = self._generate_summary(clusters, sizes)
         
-        # Écrire dans le fichier JSON
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(all_metadata, f, indent=2, ensure_ascii=False)
+        # Synthèse: {"total_clusters", "clusters", "summary"}, même texte que
+        # json.dumps(indent=2). Les documents sont réindentés d'un niveau
+        # (une chaîne JSON ne contient jamais de retour à la ligne brut) et
+        # écrits comme fragments séparés.
+        summary_json = _JSON_ENCODER.encode(summary).replace("\n", "\n  ")
+        parts: List[str] = [f'{{\n  "total_clusters": {len(clusters)},\n  "clusters": ']
+        if documents:
+            separator = ",\n    "
+            parts.append("[\n    ")
+            for document in documents:
+                parts.append(document.replace("\n", "\n    "))
+                parts.append(separator)
+            parts[-1] = "\n  ]"
+        else:
+            parts.append("[]")
+        parts.append(f',\n  "summary": {summary_json}\n}}')
+        
+        _write_parts(output_path, parts)
         
         print(f"Métadonnées écrites dans: {summary_filename}")
         print(f"Nombre de clusters: {len(clusters)}")
         
-        # Écrire aussi un fichier individuel pour chaque cluster
-        for cluster in clusters:
-            self.write_cluster_metadata(cluster)
+        # Métadonnées individuelles de chaque cluster, sur demande
+        if archive_filename is not None:
+            self.write_clusters_archive(clusters, archive_filename, documents)
+            print(f"Métadonnées individuelles archivées dans: {archive_filename} ({len(clusters)} clusters)")
         
-        print(f"Fichiers individuels créés: {len(clusters)}")
+        if write_individual:
+            out_prefix = self._out_prefix
+            filename_of = self._cluster_metadata_filename
+            for cluster, document in zip(clusters, documents):
+                _write_text(out_prefix + filename_of(cluster), document)
+            
+            print(f"Fichiers individuels créés: {len(clusters)}")
         
         return output_path
     
-    def _generate_summary(self, clusters: List[Cluster]) -> dict:
+    def _generate_summary(self, clusters: List[Cluster],
+                          sizes: Optional[Sequence[float]] = None) -> dict:
         """
         Génère un résumé statistique des clusters.
         
         Args:
             clusters (List[Cluster]): Liste des clusters
+            sizes (Optional[Sequence[float]]): Tailles des clusters déjà
+                calculées (alignées sur clusters)
             
         Returns:
             dict: Résumé avec statistiques
@@ -111,10 +298,13 @@ class MetadataWriter:
         if not clusters:
             return {}
         
-        total_files = sum(len(c.files) for c in clusters)
-        total_size = sum(c.get_total_size() for c in clusters)
-        sizes = [c.get_total_size() for c in clusters]
+        # Une seule lecture des clusters par colonne (tailles, nombres de
+        # fichiers); sommes, minima et maxima sont calculés sur ces listes
+        if sizes is None:
+            sizes = [c.get_total_size() for c in clusters]
         file_counts = [len(c.files) for c in clusters]
+        total_files = sum(file_counts)
+        total_size = sum(sizes)
         
         return {
             "total_files": total_files,
@@ -144,36 +334,42 @@ class MetadataWriter:
         """
         output_path = os.path.join(self.output_dir, filename)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("="*80 + "\n")
-            f.write("RAPPORT DE FUSION DE FICHIERS HDFS\n")
-            f.write("="*80 + "\n\n")
-            
-            f.write(f"Nombre de fichiers originaux: {original_file_count}\n")
-            f.write(f"Nombre de clusters créés: {len(clusters)}\n")
-            
-            if original_file_count > 0:
-                reduction = (1 - len(clusters) / original_file_count) * 100
-                f.write(f"Taux de réduction: {reduction:.2f}%\n\n")
-            
-            f.write("-"*80 + "\n")
-            f.write("DÉTAILS DES CLUSTERS\n")
-            f.write("-"*80 + "\n\n")
+        # Le rapport est construit en mémoire puis écrit en un seul appel
+        parts: List[str] = []
+        add = parts.append
+        
+        add("="*80 + "\n")
+        add("RAPPORT DE FUSION DE FICHIERS HDFS\n")
+        add("="*80 + "\n\n")
+        
+        add(f"Nombre de fichiers originaux: {original_file_count}\n")
+        add(f"Nombre de clusters créés: {len(clusters)}\n")
+        
+        if original_file_count > 0:
+            reduction = (1 - len(clusters) / original_file_count) * 100
+            add(f"Taux de réduction: {reduction:.2f}%\n\n")
+        
+        add("-"*80 + "\n")
+        add("DÉTAILS DES CLUSTERS\n")
+        add("-"*80 + "\n\n")
+        
+        for cluster in sorted(clusters, key=attrgetter('cluster_id')):
+            add(f"Cluster ID: {cluster.cluster_id}\n"
+                f"  Nombre de fichiers: {len(cluster.files)}\n"
+                f"  Taille totale: {cluster.get_total_size():.2f} MB\n"
+                f"  Fichiers:\n")
             
-            for cluster in sorted(clusters, key=lambda c: c.cluster_id):
-                f.write(f"Cluster ID: {cluster.cluster_id}\n")
-                f.write(f"  Nombre de fichiers: {len(cluster.files)}\n")
-                f.write(f"  Taille totale: {cluster.get_total_size():.2f} MB\n")
-                f.write(f"  Fichiers:\n")
-                
-                for file in sorted(cluster.files, key=lambda f: f.name):
-                    f.write(f"    - {file.name} ({file.size_mb:.2f} MB)\n")
-                
-                f.write("\n")
+            parts.extend([f"    - {file.name} ({file.size_mb:.2f} MB)\n"
+                          for file in sorted(cluster.files, key=attrgetter('name'))])
             
-            f.write("="*80 + "\n")
-            f.write("FIN DU RAPPORT\n")
-            f.write("="*80 + "\n")
+            add("\n")
+        
+        add("="*80 + "\n")
+        add("FIN DU RAPPORT\n")
+        add("="*80 + "\n")
+        
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(''.join(parts))
         
         print(f"Rapport détaillé écrit dans: {filename}")
         
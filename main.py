@@ -6,12 +6,14 @@ Auteur: Projet HDFS
 Date: 2025
 """
 
-import sys
+import argparse
 import os
+import re
+import sys
+from typing import Callable, List, Optional, Tuple
 
-# Ajouter le répertoire parent au path pour les imports
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
+# Les imports suivants se résolvent depuis le répertoire de ce script, que
+# Python place en tête de sys.path quand on lance "python main.py"
 from models.small_file import SmallFile, HDFS_BLOCK_SIZE_MB, SMALL_FILE_THRESHOLD, SMALL_FILE_MAX_SIZE_MB
 from models.cluster import Cluster
 from core.distance_matrix import DistanceMatrix
@@ -23,106 +25,166 @@ from data_io.file_generator import FileGenerator
 from data_io.metadata_writer import MetadataWriter
 
 
+def print_lines(*lines: str) -> None:
+    """Affiche plusieurs lignes en un seul appel d'écriture."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def print_section(title: str, char: str = "=") -> None:
+    """Affiche un titre de section encadré par deux lignes de séparation."""
+    print_lines("\n" + char*80, title, char*80)
+
+
 def print_header():
     """Affiche l'en-tête du programme."""
-    print("\n" + "="*80)
-    print(" "*20 + "SYSTÈME DE FUSION DE FICHIERS HDFS")
-    print(" "*15 + "Clustering Hiérarchique Agglomératif")
-    print(" "*20 + "Méthode: Single-Linkage")
-    print(" "*15 + "Basé sur l'article de recherche HDFS")
-    print("="*80)
-    print(f"\n📋 Configuration (selon article de recherche):")
-    print(f"  • Taille de bloc HDFS: {HDFS_BLOCK_SIZE_MB} MB")
-    print(f"  • Seuil petits fichiers: {SMALL_FILE_THRESHOLD * 100:.0f}% = {SMALL_FILE_MAX_SIZE_MB} MB")
-    print(f"  • Fichiers < {SMALL_FILE_MAX_SIZE_MB} MB → éligibles pour fusion")
-    print(f"  • Fichiers ≥ {SMALL_FILE_MAX_SIZE_MB} MB → traités directement en HDFS")
-    print("="*80 + "\n")
+    print_lines("\n" + "="*80,
+                " "*20 + "SYSTÈME DE FUSION DE FICHIERS HDFS",
+                " "*15 + "Clustering Hiérarchique Agglomératif",
+                " "*20 + "Méthode: Single-Linkage",
+                " "*15 + "Basé sur l'article de recherche HDFS",
+                "="*80,
+                f"\n📋 Configuration (selon article de recherche):",
+                f"  • Taille de bloc HDFS: {HDFS_BLOCK_SIZE_MB} MB",
+                f"  • Seuil petits fichiers: {SMALL_FILE_THRESHOLD * 100:.0f}% = {SMALL_FILE_MAX_SIZE_MB} MB",
+                f"  • Fichiers < {SMALL_FILE_MAX_SIZE_MB} MB → éligibles pour fusion",
+                f"  • Fichiers ≥ {SMALL_FILE_MAX_SIZE_MB} MB → traités directement en HDFS",
+                "="*80 + "\n")
 
 
 def print_footer():
     """Affiche le pied de page du programme."""
-    print("\n" + "="*80)
-    print(" "*25 + "TRAITEMENT TERMINÉ AVEC SUCCÈS")
-    print("="*80 + "\n")
+    print_lines("\n" + "="*80,
+                " "*25 + "TRAITEMENT TERMINÉ AVEC SUCCÈS",
+                "="*80 + "\n")
+
 
+def _print_clustering_stats(clustering: AgglomerativeClustering, files: List[SmallFile],
+                            clusters: List[Cluster]) -> None:
+    """Affiche les statistiques du clustering (exemple 1)."""
+    stats = clustering.get_statistics()
+    print_lines(f"\n📊 STATISTIQUES DU CLUSTERING (selon article):",
+                f"  Fichiers analysés:",
+                f"    - Total reçu: {stats.get('total_files_received', 0)}",
+                f"    - Petits fichiers (< {stats.get('threshold_mb', 96)} MB): {stats.get('small_files_processed', 0)}",
+                f"    - Exclus (≥ {stats.get('threshold_mb', 96)} MB): {stats.get('files_excluded', 0)}",
+                f"\n  Résultats du clustering:",
+                f"    - Clusters créés: {stats['num_clusters']}",
+                f"    - Taille moyenne: {stats.get('avg_cluster_size_mb', 0):.2f} MB",
+                f"    - Taille min: {stats.get('min_cluster_size_mb', 0):.2f} MB",
+                f"    - Taille max: {stats.get('max_cluster_size_mb', 0):.2f} MB",
+                f"    - Fichiers/cluster: {stats.get('avg_files_per_cluster', 0):.2f}",
+                f"    - Itérations: {stats['iterations']}")
+
+
+def _print_reduction(clustering: AgglomerativeClustering, files: List[SmallFile],
+                     clusters: List[Cluster]) -> None:
+    """Affiche le taux de réduction des entrées de métadonnées (exemple 3)."""
+    reduction_rate = (1 - len(clusters) / len(files)) * 100
+    print_lines(f"\n📊 RÉSULTAT:",
+                f"  Fichiers originaux: {len(files)}",
+                f"  Clusters créés: {len(clusters)}",
+                f"  Réduction: {reduction_rate:.2f}%",
+                f"  → Économie de {len(files) - len(clusters)} entrées de métadonnées!")
 
-def example_1_realistic_scenario():
+
+def _run_example(files: List[SmallFile], prefix: str, max_cluster_mb: float = 128.0,
+                 sections: bool = True,
+                 after_clustering: Optional[Callable[[AgglomerativeClustering, List[SmallFile],
+                                                      List[Cluster]], None]] = None,
+                 output_dir: str = "output") -> None:
     """
-    Exemple 1: Scénario réaliste avec génération automatique de fichiers.
-    
-    Utilise un mélange de fichiers de différentes tailles pour simuler
-    un environnement HDFS typique.
+    Chaîne de traitement commune aux exemples.
+    
+    Clustering → dendrogramme → analyse NameNode → fusion → index →
+    métadonnées ("<prefix>_clusters.json", "<prefix>_report.txt") →
+    étapes de l'algorithme.
+    
+    Args:
+        files (List[SmallFile]): Fichiers à regrouper
+        prefix (str): Préfixe des fichiers de résultats (ex: "example1")
+        max_cluster_mb (float): Taille maximale d'un cluster en MB
+        sections (bool): Affiche un titre avant chaque phase
+        after_clustering (Optional[Callable]): Affichage supplémentaire
+            appelé avec (clustering, files, clusters) après le clustering
+        output_dir (str): Dossier des résultats
     """
-    print("\n" + "-"*80)
-    print("EXEMPLE 1: SCÉNARIO RÉALISTE (FICHIERS MIXTES)")
-    print("-"*80)
-    
-    # Paramètres
-    max_cluster_size = 128.0  # MB
-    output_dir = "output"
-    
-    # 1. Générer des fichiers de test
-    generator = FileGenerator(seed=42)
-    files = generator.generate_realistic_scenario("mixed")
-    FileGenerator.display_files(files, max_display=15)
-    
-    # 2. Appliquer le clustering
-    clustering = AgglomerativeClustering(max_cluster_size_mb=max_cluster_size)
+    # 1. Clustering avec algorithme agglomératif hiérarchique
+    if sections:
+        print_section("PHASE DE CLUSTERING")
+    clustering = AgglomerativeClustering(max_cluster_size_mb=max_cluster_mb, verbose=2)
     clusters = clustering.fit(files)
     
-    # 3. Afficher les statistiques
-    stats = clustering.get_statistics()
-    print(f"\n📊 STATISTIQUES DU CLUSTERING (selon article):")
-    print(f"  Fichiers analysés:")
-    print(f"    - Total reçu: {stats.get('total_files_received', 0)}")
-    print(f"    - Petits fichiers (< {stats.get('threshold_mb', 96)} MB): {stats.get('small_files_processed', 0)}")
-    print(f"    - Exclus (≥ {stats.get('threshold_mb', 96)} MB): {stats.get('files_excluded', 0)}")
-    print(f"\n  Résultats du clustering:")
-    print(f"    - Clusters créés: {stats['num_clusters']}")
-    print(f"    - Taille moyenne: {stats.get('avg_cluster_size_mb', 0):.2f} MB")
-    print(f"    - Taille min: {stats.get('min_cluster_size_mb', 0):.2f} MB")
-    print(f"    - Taille max: {stats.get('max_cluster_size_mb', 0):.2f} MB")
-    print(f"    - Fichiers/cluster: {stats.get('avg_files_per_cluster', 0):.2f}")
-    print(f"    - Itérations: {stats['iterations']}")
-    
-    # 4. Afficher le dendrogramme (selon article)
+    if after_clustering is not None:
+        after_clustering(clustering, files, clusters)
+    
+    # 2. Afficher le dendrogramme (selon article)
+    if sections:
+        print_section("DENDROGRAMME (Structure Hiérarchique)")
     clustering.dendrogram.print_tree()
     clustering.dendrogram.print_merge_history()
     
-    # 5. Analyse mémoire NameNode (selon article)
+    # 3. Analyse mémoire NameNode (selon article)
+    if sections:
+        print_section("ANALYSE MÉMOIRE NAMENODE")
     namenode = NameNodeMemory()
     print(namenode.get_detailed_report(files, clusters))
     
-    # 6. Fusionner les fichiers
+    # 4. Fusion des fichiers
+    if sections:
+        print_section("FUSION DES FICHIERS")
     merger = FileMerger(output_dir=output_dir)
-    merged_files = merger.merge_all_clusters(clusters)
+    merger.merge_all_clusters(clusters)
     
-    # 7. Créer l'index de fichiers (pour récupération)
+    # 5. Créer l'index de fichiers (pour récupération)
     file_index = FileIndex()
     file_index.build_index(clusters)
     file_index.print_index()
     
-    # 8. Écrire les métadonnées
+    # 6. Écrire les métadonnées
     metadata_writer = MetadataWriter(output_dir=output_dir)
-    metadata_writer.write_all_metadata(clusters, summary_filename="example1_clusters.json")
-    metadata_writer.write_detailed_report(clusters, len(files), filename="example1_report.txt")
+    metadata_writer.write_all_metadata(clusters, summary_filename=f"{prefix}_clusters.json",
+                                       write_individual=True)
+    metadata_writer.write_detailed_report(clusters, len(files), filename=f"{prefix}_report.txt")
     
-    # 9. Afficher les étapes de l'algorithme
+    # 7. Afficher les étapes de l'algorithme
     clustering.print_algorithm_steps()
+
+
+def example_1_realistic_scenario(max_cluster_size: float = 128.0, seed: int = 42):
+    """
+    Exemple 1: Scénario réaliste avec génération automatique de fichiers.
+    
+    Utilise un mélange de fichiers de différentes tailles pour simuler
+    un environnement HDFS typique.
+    
+    Args:
+        max_cluster_size (float): Taille maximale d'un cluster en MB
+        seed (int): Graine du générateur de fichiers
+    """
+    print_section("EXEMPLE 1: SCÉNARIO RÉALISTE (FICHIERS MIXTES)", "-")
+    
+    # Générer des fichiers de test
+    generator = FileGenerator(seed=seed)
+    files = generator.generate_realistic_scenario("mixed")
+    FileGenerator.display_files(files, max_display=15)
+    
+    _run_example(files, "example1", max_cluster_size, sections=False,
+                 after_clustering=_print_clustering_stats)
     
-    print(f"\n✓ Exemple 1 terminé - Résultats dans le dossier '{output_dir}'")
+    print(f"\n✓ Exemple 1 terminé - Résultats dans le dossier 'output'")
 
 
-def example_2_custom_files():
+def example_2_custom_files(max_cluster_size: float = 128.0):
     """
     Exemple 2: Liste personnalisée de fichiers.
     
     Crée manuellement une liste de fichiers pour démontrer
     le fonctionnement du clustering sur des données spécifiques.
+    
+    Args:
+        max_cluster_size (float): Taille maximale d'un cluster en MB
     """
-    print("\n" + "-"*80)
-    print("EXEMPLE 2: LISTE PERSONNALISÉE DE FICHIERS")
-    print("-"*80)
+    print_section("EXEMPLE 2: LISTE PERSONNALISÉE DE FICHIERS", "-")
     
     # Créer manuellement une liste de fichiers
     files = [
@@ -143,134 +205,135 @@ def example_2_custom_files():
         SmallFile("script.py", 3.0),
     ]
     
-    print(f"\nFichiers créés: {len(files)}")
-    for i, f in enumerate(files, 1):
-        print(f"  {i}. {f}")
-    
-    # 1. Clustering avec algorithme agglomératif hiérarchique
-    print("\n" + "="*80)
-    print("PHASE DE CLUSTERING")
-    print("="*80)
-    clustering = AgglomerativeClustering(max_cluster_size_mb=128.0)
-    clusters = clustering.fit(files)
-    
-    # 2. Afficher le dendrogramme
-    print("\n" + "="*80)
-    print("DENDROGRAMME (Structure Hiérarchique)")
-    print("="*80)
-    clustering.dendrogram.print_tree()
-    clustering.dendrogram.print_merge_history()
-    
-    # 3. Analyse mémoire NameNode
-    print("\n" + "="*80)
-    print("ANALYSE MÉMOIRE NAMENODE")
-    print("="*80)
-    namenode = NameNodeMemory()
-    print(namenode.get_detailed_report(files, clusters))
-    
-    # 4. Fusion des fichiers
-    print("\n" + "="*80)
-    print("FUSION DES FICHIERS")
-    print("="*80)
-    merger = FileMerger(output_dir="output")
-    merger.merge_all_clusters(clusters)
-    
-    # 5. Créer l'index de fichiers
-    file_index = FileIndex()
-    file_index.build_index(clusters)
-    file_index.print_index()
-    
-    # 6. Écrire les métadonnées
-    metadata_writer = MetadataWriter(output_dir="output")
-    metadata_writer.write_all_metadata(clusters, summary_filename="example2_clusters.json")
-    metadata_writer.write_detailed_report(clusters, len(files), filename="example2_report.txt")
+    line = "  {}. {} ({:.2f} MB)".format
+    print_lines(f"\nFichiers créés: {len(files)}",
+                *[line(i, f.name, f.size_mb) for i, f in enumerate(files, 1)])
     
-    # 7. Afficher les étapes de l'algorithme
-    clustering.print_algorithm_steps()
+    _run_example(files, "example2", max_cluster_size)
     
     print(f"\n✓ Exemple 2 terminé - Résultats dans le dossier 'output'")
 
 
-def example_3_small_files():
+def example_3_small_files(max_cluster_size: float = 128.0, seed: int = 123):
     """
     Exemple 3: Beaucoup de très petits fichiers.
     
     Simule le scénario typique du "small files problem" dans HDFS
     où de nombreux petits fichiers créent une surcharge de métadonnées.
+    
+    Args:
+        max_cluster_size (float): Taille maximale d'un cluster en MB
+        seed (int): Graine du générateur de fichiers
     """
-    print("\n" + "-"*80)
-    print("EXEMPLE 3: PROBLÈME DES PETITS FICHIERS (SMALL FILES PROBLEM)")
-    print("-"*80)
+    print_section("EXEMPLE 3: PROBLÈME DES PETITS FICHIERS (SMALL FILES PROBLEM)", "-")
     
     # Générer beaucoup de petits fichiers
-    generator = FileGenerator(seed=123)
+    generator = FileGenerator(seed=seed)
     files = generator.generate_realistic_scenario("small")
     
-    print(f"\nNombre de fichiers: {len(files)}")
-    print(f"Taille totale: {sum(f.size_mb for f in files):.2f} MB")
-    print(f"Taille moyenne: {sum(f.size_mb for f in files) / len(files):.2f} MB")
+    # Tailles lues une seule fois (colonne tenue par le générateur)
+    total_mb = sum(generator.last_sizes)
+    print_lines(f"\nNombre de fichiers: {len(files)}",
+                f"Taille totale: {total_mb:.2f} MB",
+                f"Taille moyenne: {total_mb / len(files):.2f} MB")
     
-    # 1. Clustering avec algorithme agglomératif hiérarchique
-    print("\n" + "="*80)
-    print("PHASE DE CLUSTERING")
-    print("="*80)
-    clustering = AgglomerativeClustering(max_cluster_size_mb=128.0)
-    clusters = clustering.fit(files)
+    _run_example(files, "example3", max_cluster_size, after_clustering=_print_reduction)
     
-    # 2. Calculer le taux de réduction
-    reduction_rate = (1 - len(clusters) / len(files)) * 100
-    print(f"\n📊 RÉSULTAT:")
-    print(f"  Fichiers originaux: {len(files)}")
-    print(f"  Clusters créés: {len(clusters)}")
-    print(f"  Réduction: {reduction_rate:.2f}%")
-    print(f"  → Économie de {len(files) - len(clusters)} entrées de métadonnées!")
-    
-    # 3. Afficher le dendrogramme
-    print("\n" + "="*80)
-    print("DENDROGRAMME (Structure Hiérarchique)")
-    print("="*80)
-    clustering.dendrogram.print_tree()
-    clustering.dendrogram.print_merge_history()
+    print(f"\n✓ Exemple 3 terminé - Résultats dans le dossier 'output'")
+
+
+def run_generated(num_files: int, max_size: float, scenario: str = "mixed",
+                  seed: Optional[int] = None):
+    """
+    Génère des fichiers, les regroupe et écrit les résultats (sans saisie).
     
-    # 4. Analyse mémoire NameNode
-    print("\n" + "="*80)
-    print("ANALYSE MÉMOIRE NAMENODE")
-    print("="*80)
-    namenode = NameNodeMemory()
-    print(namenode.get_detailed_report(files, clusters))
+    Traitement du mode interactif une fois les paramètres connus.
+    
+    Args:
+        num_files (int): Nombre de fichiers à générer (<= 20: distribution
+                         du scénario, sinon tailles aléatoires)
+        max_size (float): Taille maximale d'un cluster en MB
+        scenario (str): Distribution ("mixed", "small", "medium", "large")
+        seed (Optional[int]): Graine du générateur (None = aléatoire)
+    """
+    # Générer les fichiers
+    generator = FileGenerator(seed=seed)
+    
+    if num_files <= 20:
+        files = generator.generate_realistic_scenario(scenario)
+    else:
+        files = generator.generate(num_files)
+    
+    FileGenerator.display_files(files, max_display=10)
+    
+    # Clustering
+    clustering = AgglomerativeClustering(max_cluster_size_mb=max_size, verbose=2)
+    clusters = clustering.fit(files)
     
-    # 5. Fusion des fichiers
-    print("\n" + "="*80)
-    print("FUSION DES FICHIERS")
-    print("="*80)
+    # Fusion et métadonnées
     merger = FileMerger(output_dir="output")
     merger.merge_all_clusters(clusters)
     
-    # 6. Créer l'index de fichiers
-    file_index = FileIndex()
-    file_index.build_index(clusters)
-    file_index.print_index()
-    
-    # 7. Écrire les métadonnées
     metadata_writer = MetadataWriter(output_dir="output")
-    metadata_writer.write_all_metadata(clusters, summary_filename="example3_clusters.json")
-    metadata_writer.write_detailed_report(clusters, len(files), filename="example3_report.txt")
+    metadata_writer.write_all_metadata(clusters, summary_filename="interactive_clusters.json")
+    metadata_writer.write_detailed_report(clusters, len(files), filename="interactive_report.txt")
     
-    # 8. Afficher les étapes de l'algorithme
-    clustering.print_algorithm_steps()
+    print(f"\n✓ Traitement terminé - Résultats dans le dossier 'output'")
+
+
+# Choix de scénario du mode interactif
+INTERACTIVE_SCENARIOS = {
+    "1": "mixed",
+    "2": "small",
+    "3": "medium",
+    "4": "large"
+}
+
+# Variable d'environnement fournissant les réponses du mode interactif,
+# au format "nombre_de_fichiers taille_max_mb scénario" (ex: "30 128 2")
+INTERACTIVE_CONFIG_ENV = "HDFS_INTERACTIVE_CONFIG"
+_INTERACTIVE_CONFIG_RE = re.compile(r"\s*(\d+)\s+(\d+(?:\.\d+)?)\s+([1-4])\s*")
+
+
+def _parse_interactive_input(text: str) -> Tuple[int, float, str]:
+    """
+    Lit les trois réponses du mode interactif sur une seule ligne.
     
-    print(f"\n✓ Exemple 3 terminé - Résultats dans le dossier 'output'")
+    Args:
+        text (str): "nombre_de_fichiers taille_max_mb scénario" (ex: "30 128 2")
+        
+    Returns:
+        Tuple[int, float, str]: (nombre de fichiers, taille max en MB, scénario)
+        
+    Raises:
+        ValueError: Si le texte ne respecte pas le format
+    """
+    match = _INTERACTIVE_CONFIG_RE.fullmatch(text)
+    if match is None:
+        raise ValueError(f"configuration invalide '{text}' "
+                         f"(attendu: 'nombre_de_fichiers taille_max_mb scénario(1-4)')")
+    num_files, max_size, choice = match.groups()
+    return int(num_files), float(max_size), INTERACTIVE_SCENARIOS[choice]
 
 
 def interactive_mode():
     """
     Mode interactif permettant à l'utilisateur de configurer le clustering.
+    
+    Si la variable d'environnement HDFS_INTERACTIVE_CONFIG est définie
+    (ex: "30 128 2"), les réponses y sont lues au lieu d'être demandées.
     """
-    print("\n" + "-"*80)
-    print("MODE INTERACTIF")
-    print("-"*80)
+    print_section("MODE INTERACTIF", "-")
     
     try:
+        config = os.environ.get(INTERACTIVE_CONFIG_ENV)
+        if config is not None:
+            num_files, max_size, scenario = _parse_interactive_input(config)
+            print(f"\nConfiguration lue dans {INTERACTIVE_CONFIG_ENV}: "
+                  f"{num_files} fichiers, {max_size} MB, scénario {scenario}")
+            run_generated(num_files, max_size, scenario)
+            return
+        
         # Demander le nombre de fichiers
         num_files = int(input("\nNombre de fichiers à générer (ex: 30): "))
         
@@ -278,44 +341,15 @@ def interactive_mode():
         max_size = float(input("Taille maximale d'un cluster en MB (ex: 128): "))
         
         # Demander le type de scénario
-        print("\nScénarios disponibles:")
-        print("  1. Mixed (mélange)")
-        print("  2. Small (petits fichiers)")
-        print("  3. Medium (fichiers moyens)")
-        print("  4. Large (gros fichiers)")
+        print_lines("\nScénarios disponibles:",
+                    "  1. Mixed (mélange)",
+                    "  2. Small (petits fichiers)",
+                    "  3. Medium (fichiers moyens)",
+                    "  4. Large (gros fichiers)")
         scenario_choice = input("Choisir un scénario (1-4): ")
+        scenario = INTERACTIVE_SCENARIOS.get(scenario_choice, "mixed")
         
-        scenario_map = {
-            "1": "mixed",
-            "2": "small",
-            "3": "medium",
-            "4": "large"
-        }
-        scenario = scenario_map.get(scenario_choice, "mixed")
-        
-        # Générer les fichiers
-        generator = FileGenerator()
-        
-        if num_files <= 20:
-            files = generator.generate_realistic_scenario(scenario)
-        else:
-            files = generator.generate(num_files)
-        
-        FileGenerator.display_files(files, max_display=10)
-        
-        # Clustering
-        clustering = AgglomerativeClustering(max_cluster_size_mb=max_size)
-        clusters = clustering.fit(files)
-        
-        # Fusion et métadonnées
-        merger = FileMerger(output_dir="output")
-        merger.merge_all_clusters(clusters)
-        
-        metadata_writer = MetadataWriter(output_dir="output")
-        metadata_writer.write_all_metadata(clusters, summary_filename="interactive_clusters.json")
-        metadata_writer.write_detailed_report(clusters, len(files), filename="interactive_report.txt")
-        
-        print(f"\n✓ Traitement terminé - Résultats dans le dossier 'output'")
+        run_generated(num_files, max_size, scenario)
         
     except ValueError as e:
         print(f"\n❌ Erreur de saisie: {e}")
@@ -330,13 +364,13 @@ def main():
     print_header()
     
     # Menu principal
-    print("Choisissez un mode d'exécution:\n")
-    print("  1. Exemple 1: Scénario réaliste (fichiers mixtes)")
-    print("  2. Exemple 2: Liste personnalisée de fichiers")
-    print("  3. Exemple 3: Problème des petits fichiers")
-    print("  4. Mode interactif")
-    print("  5. Exécuter tous les exemples")
-    print("  0. Quitter\n")
+    print_lines("Choisissez un mode d'exécution:\n",
+                "  1. Exemple 1: Scénario réaliste (fichiers mixtes)",
+                "  2. Exemple 2: Liste personnalisée de fichiers",
+                "  3. Exemple 3: Problème des petits fichiers",
+                "  4. Mode interactif",
+                "  5. Exécuter tous les exemples",
+                "  0. Quitter\n")
     
     choice = input("Votre choix (0-5): ").strip()
     
@@ -362,5 +396,79 @@ def main():
     print_footer()
 
 
+# Scénarios exécutables sans menu (voir run)
+SCENARIOS = ("1", "2", "3", "4", "all")
+
+
+def run(scenario: str = "all", num_files: int = 30, max_cluster_mb: float = 128.0,
+        seed: Optional[int] = None, distribution: str = "mixed"):
+    """
+    Exécute un scénario sans menu ni saisie clavier.
+    
+    Point d'entrée non interactif (scripts, mesures de performance).
+    
+    Args:
+        scenario (str): "1", "2", "3" (exemples), "4" (fichiers générés,
+                        comme le mode interactif) ou "all" (exemples 1 à 3)
+        num_files (int): Nombre de fichiers générés (scénario 4)
+        max_cluster_mb (float): Taille maximale d'un cluster en MB
+        seed (Optional[int]): Graine du générateur (None: graines des
+                              exemples, aléatoire pour le scénario 4)
+        distribution (str): Distribution du scénario 4 ("mixed", "small",
+                            "medium", "large")
+        
+    Raises:
+        ValueError: Si le scénario est inconnu
+    """
+    if scenario not in SCENARIOS:
+        raise ValueError(f"Scénario inconnu: {scenario} (attendu: {', '.join(SCENARIOS)})")
+    
+    print_header()
+    
+    if scenario in ("1", "all"):
+        example_1_realistic_scenario(max_cluster_mb, 42 if seed is None else seed)
+    if scenario in ("2", "all"):
+        example_2_custom_files(max_cluster_mb)
+    if scenario in ("3", "all"):
+        example_3_small_files(max_cluster_mb, 123 if seed is None else seed)
+    if scenario == "4":
+        run_generated(num_files, max_cluster_mb, distribution, seed)
+    
+    print_footer()
+
+
+def cli(argv: Optional[List[str]] = None):
+    """
+    Interface en ligne de commande.
+    
+    Sans argument, affiche le menu interactif (main); sinon exécute
+    directement le scénario demandé (run).
+    
+    Args:
+        argv (Optional[List[str]]): Arguments (défaut: sys.argv[1:])
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        main()
+        return
+    
+    parser = argparse.ArgumentParser(
+        description="Fusion de petits fichiers HDFS par clustering hiérarchique (single-linkage)")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="all",
+                        help="1, 2, 3: exemples; 4: fichiers générés; all: exemples 1 à 3 (défaut)")
+    parser.add_argument("--num-files", type=int, default=30,
+                        help="nombre de fichiers générés pour le scénario 4 (défaut: 30)")
+    parser.add_argument("--max-cluster-mb", type=float, default=128.0,
+                        help="taille maximale d'un cluster en MB (défaut: 128)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="graine du générateur de fichiers")
+    parser.add_argument("--distribution", choices=("mixed", "small", "medium", "large"),
+                        default="mixed", help="distribution du scénario 4 (défaut: mixed)")
+    args = parser.parse_args(argv)
+    
+    run(args.scenario, args.num_files, args.max_cluster_mb, args.seed, args.distribution)
+
+
 if __name__ == "__main__":
-    main()
+    cli()
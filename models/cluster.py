@@ -11,10 +11,19 @@ Le clustering permet de réduire la consommation mémoire du NameNode:
 - Après: m clusters = m * 150 bytes (où m << n)
 """
 
+from itertools import count
+from operator import attrgetter
 from typing import List
 from .small_file import SmallFile
 
 
+# Générateur des IDs uniques des clusters (1, 2, 3, ...)
+_id_gen = count(1)
+
+# Lecture du nom d'un fichier (map sans fonction Python par élément)
+_get_name = attrgetter('name')
+
+
 class Cluster:
     """
     Représente un cluster Ci dans l'ensemble C = {C1, C2, ..., Cm}.
@@ -31,10 +40,12 @@ class Cluster:
     Attributes:
         cluster_id (int): Identifiant unique du cluster (C1, C2, ...)
         files (List[SmallFile]): Ensemble des fichiers {F1, F2, ...} dans le cluster
+        _total_size (float): Taille totale des fichiers en MB, tenue à jour
+                             à chaque ajout ou fusion
     """
     
-    # Compteur statique pour générer des IDs uniques
-    _id_counter = 0
+    # Pas de __dict__ par instance: mémoire réduite et accès aux attributs direct
+    __slots__ = ('cluster_id', 'files', '_total_size')
     
     def __init__(self, files: List[SmallFile] = None):
         """
@@ -44,9 +55,9 @@ class Cluster:
             files (List[SmallFile], optional): Liste initiale de fichiers.
                                                 Par défaut, liste vide.
         """
-        Cluster._id_counter += 1
-        self.cluster_id = Cluster._id_counter
+        self.cluster_id = next(_id_gen)
         self.files = files if files is not None else []
+        self._total_size = sum(f.size_mb for f in self.files)
     
     def add_file(self, file: SmallFile) -> None:
         """
@@ -56,30 +67,43 @@ class Cluster:
             file (SmallFile): Le fichier à ajouter
         """
         self.files.append(file)
+        self._total_size += file.size_mb
     
     def get_total_size(self) -> float:
         """
         Calcule la taille totale du cluster.
         
+        La somme est maintenue de façon incrémentale (O(1) par appel).
+        
         Returns:
             float: La somme des tailles de tous les fichiers en MB
         """
-        return sum(f.size_mb for f in self.files)
+        return self._total_size
     
-    def merge_with(self, other: 'Cluster') -> 'Cluster':
+    def merge_with(self, other: 'Cluster', reuse_files: bool = False) -> 'Cluster':
         """
         [ALGORITHM 1 - Ligne 11] Fusionne ce cluster avec un autre.
         
         Selon l'article: "C = ({C} ∪ {C'})" - Union des deux clusters.
+        Les fichiers de C puis ceux de C' sont conservés dans cet ordre.
         
         Args:
             other (Cluster): L'autre cluster C' à fusionner
+            reuse_files (bool): Si True, le nouveau cluster reprend la liste
+                de fichiers de ce cluster et y ajoute ceux de C' (coût en
+                O(|C'|) au lieu de O(|C| + |C'|)). Ce cluster ne doit plus
+                être utilisé ensuite: sa liste est partagée.
             
         Returns:
             Cluster: Nouveau cluster C'' = C ∪ C'
         """
         new_cluster = Cluster()
-        new_cluster.files = self.files + other.files
+        if reuse_files:
+            new_cluster.files = self.files
+            new_cluster.files.extend(other.files)
+        else:
+            new_cluster.files = self.files + other.files
+        new_cluster._total_size = self._total_size + other._total_size
         return new_cluster
     
     def can_merge_with(self, other: 'Cluster', max_size_mb: float = 128.0) -> bool:
@@ -95,8 +119,7 @@ class Cluster:
         Returns:
             bool: True si |C| + |C'| ≤ 128 MB, False sinon
         """
-        total_size = self.get_total_size() + other.get_total_size()
-        return total_size <= max_size_mb
+        return self._total_size + other._total_size <= max_size_mb
     
     def __len__(self) -> int:
         """
@@ -123,11 +146,12 @@ class Cluster:
         Returns:
             dict: Dictionnaire contenant les métadonnées du cluster
         """
+        files = self.files
         return {
             "cluster_id": self.cluster_id,
-            "files": [f.name for f in self.files],
-            "file_count": len(self.files),
-            "size_total_mb": round(self.get_total_size(), 2)
+            "files": list(map(_get_name, files)),
+            "file_count": len(files),
+            "size_total_mb": round(self._total_size, 2)
         }
     
     @staticmethod
@@ -135,4 +159,5 @@ class Cluster:
         """
         Réinitialise le compteur d'IDs (utile pour les tests).
         """
-        Cluster._id_counter = 0
+        global _id_gen
+        _id_gen = count(1)
@@ -13,13 +13,28 @@ Configuration HDFS utilisée:
 - Fichiers ≥ 96 MB → traités directement par HDFS
 """
 
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, ClassVar, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    # typing.Final n'existe qu'à partir de Python 3.8; les annotations ne
+    # sont pas évaluées à l'exécution (from __future__ import annotations)
+    from typing import Final
+
 # Configuration HDFS selon l'article (Section 4):
 # "The small file is a file, whose size is less than 75% of default block size (128MB)"
-HDFS_BLOCK_SIZE_MB = 128.0  # Taille de bloc HDFS standard
-SMALL_FILE_THRESHOLD = 0.75  # Seuil: 75% de la taille de bloc
-SMALL_FILE_MAX_SIZE_MB = HDFS_BLOCK_SIZE_MB * SMALL_FILE_THRESHOLD  # 96 MB
+# Constantes Final, seuil écrit sous forme déjà calculée (96 MB)
+HDFS_BLOCK_SIZE_MB: Final[float] = 128.0  # Taille de bloc HDFS standard
+SMALL_FILE_THRESHOLD: Final[float] = 0.75  # Seuil: 75% de la taille de bloc
+SMALL_FILE_MAX_SIZE_MB: Final[float] = 96.0  # HDFS_BLOCK_SIZE_MB * SMALL_FILE_THRESHOLD
+
+assert HDFS_BLOCK_SIZE_MB * SMALL_FILE_THRESHOLD == SMALL_FILE_MAX_SIZE_MB
 
 
+@dataclass(frozen=True)
 class SmallFile:
     """
     Représente un fichier Fi dans l'ensemble S = {F1, F2, ..., Fn}.
@@ -29,27 +44,49 @@ class SmallFile:
     - Chaque fichier a un nom et une taille en MB
     - La taille est utilisée pour calculer la distance euclidienne
     
+    Un fichier est immuable (dataclass gelée): égalité et hachage portent
+    sur (name, size_mb), un SmallFile peut servir de clé de dictionnaire.
+    
     Attributes:
         name (str): Nom du fichier (ex: "doc1.txt")
         size_mb (float): Taille du fichier en mégaoctets (MB)
     """
     
-    def __init__(self, name: str, size_mb: float):
+    # Pas de __dict__ par instance: les fichiers sont créés par milliers.
+    # _str et _repr mémorisent les représentations textuelles (calculées à
+    # la première demande; hors champs, donc hors égalité et hachage).
+    # __slots__ manuel: dataclass(slots=True) demande Python 3.10
+    __slots__ = ('name', 'size_mb', '_str', '_repr')
+    
+    name: str
+    size_mb: float
+    
+    # Seuil "petit fichier" (96 MB) lié à la classe
+    _THRESHOLD: ClassVar[float] = SMALL_FILE_MAX_SIZE_MB
+    
+    def __post_init__(self) -> None:
         """
-        Initialise un objet SmallFile.
+        Valide la taille du fichier (après l'__init__ généré).
         
-        Args:
-            name (str): Le nom du fichier
-            size_mb (float): La taille du fichier en MB
-            
         Raises:
             ValueError: Si la taille est négative ou nulle
         """
-        if size_mb <= 0:
-            raise ValueError(f"La taille du fichier doit être positive: {size_mb}")
+        if self.size_mb <= 0:
+            raise ValueError(f"La taille du fichier doit être positive: {self.size_mb}")
         
-        self.name = name
-        self.size_mb = size_mb
+        object.__setattr__(self, '_str', None)
+        object.__setattr__(self, '_repr', None)
+    
+    def __getstate__(self) -> Tuple[str, float]:
+        """État pour pickle/copy: (name, size_mb)."""
+        return (self.name, self.size_mb)
+    
+    def __setstate__(self, state: Tuple[str, float]) -> None:
+        """Restaure un fichier gelé (le __setattr__ de la dataclass lève une erreur)."""
+        object.__setattr__(self, 'name', state[0])
+        object.__setattr__(self, 'size_mb', state[1])
+        object.__setattr__(self, '_str', None)
+        object.__setattr__(self, '_repr', None)
     
     def __repr__(self) -> str:
         """
@@ -58,7 +95,9 @@ class SmallFile:
         Returns:
             str: Une chaîne décrivant le fichier
         """
-        return f"SmallFile(name='{self.name}', size_mb={self.size_mb:.2f})"
+        if self._repr is None:
+            object.__setattr__(self, '_repr', f"SmallFile(name='{self.name}', size_mb={self.size_mb:.2f})")
+        return self._repr
     
     def __str__(self) -> str:
         """
@@ -67,7 +106,9 @@ class SmallFile:
         Returns:
             str: Le nom et la taille du fichier
         """
-        return f"{self.name} ({self.size_mb:.2f} MB)"
+        if self._str is None:
+            object.__setattr__(self, '_str', f"{self.name} ({self.size_mb:.2f} MB)")
+        return self._str
     
     def is_eligible_for_merging(self) -> bool:
         """
@@ -78,7 +119,7 @@ class SmallFile:
         Returns:
             bool: True si le fichier est un "petit fichier" (< 96 MB)
         """
-        return self.size_mb < SMALL_FILE_MAX_SIZE_MB
+        return self.size_mb < SmallFile._THRESHOLD
     
     def to_dict(self) -> dict:
         """
@@ -106,7 +147,48 @@ class SmallFile:
         Returns:
             bool: True si la taille < 96 MB (75% de 128 MB)
         """
-        return size_mb < SMALL_FILE_MAX_SIZE_MB
+        return size_mb < SmallFile._THRESHOLD
+    
+    @staticmethod
+    def filter_eligible(files: Sequence['SmallFile'],
+                        sizes: Optional[Sequence[float]] = None) -> List['SmallFile']:
+        """
+        Sélectionne les petits fichiers (< 96 MB) éligibles pour la fusion.
+        
+        Le test porte sur la colonne des tailles (voir build_soa), sans
+        appel de méthode par fichier. L'ordre des fichiers est conservé.
+        
+        Args:
+            files (Sequence[SmallFile]): Liste de fichiers
+            sizes (Optional[Sequence[float]]): Tailles déjà extraites
+                (alignées sur files, ex. array('d') de build_soa)
+            
+        Returns:
+            List[SmallFile]: Fichiers dont la taille est < 96 MB
+        """
+        if sizes is None:
+            sizes = [f.size_mb for f in files]
+        threshold = SmallFile._THRESHOLD
+        return [f for f, size in zip(files, sizes) if size < threshold]
+    
+    @staticmethod
+    def build_soa(files: Sequence['SmallFile']) -> Tuple[List[str], array]:
+        """
+        Vue en colonnes (Structure of Arrays) d'une liste de fichiers.
+        
+        Les tailles sont copiées dans un tableau contigu array('d'): les
+        calculs sur les tailles (distances, sommes) le parcourent sans
+        passer par un objet SmallFile par fichier.
+        
+        Args:
+            files (Sequence[SmallFile]): Liste de fichiers
+            
+        Returns:
+            Tuple[List[str], array]: (noms, tailles en MB), alignés sur files
+        """
+        names = [f.name for f in files]
+        sizes = array('d', [f.size_mb for f in files])
+        return names, sizes
     
     @staticmethod
     def get_threshold_info() -> dict: